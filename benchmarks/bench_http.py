@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark de carga HTTP da API
+
+Cria um banco temporário com N projetos e seu histórico (gerador de
+src/generate.py, com seed e datas fixas), sobe a aplicação localmente em
+outro processo (gunicorn com gunicorn.conf.py ou o servidor de
+desenvolvimento) e dispara requisições concorrentes em cada cenário:
+
+    list, detail, stats, history, search, create, update, delete, static
+
+Para cada cenário mede vazão (req/s) e latência p50/p95/p99, e imprime tudo
+em JSON junto com o commit atual, para comparar versões:
+
+    python benchmarks/bench_http.py --projects 10000 --concurrency 8 --duration 10 > antes.json
+
+Uso:
+    python benchmarks/bench_http.py --projects 1000 10000 100000 --concurrency 8 --duration 5
+    python benchmarks/bench_http.py --scenarios detail update --server dev --no-cache
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.main import create_app
+from src.generate import CATEGORY_WEIGHTS, PRIORITY_WEIGHTS, generate
+from src.models.project import db
+
+CATEGORIES = list(CATEGORY_WEIGHTS)
+PRIORITIES = list(PRIORITY_WEIGHTS)
+SEARCH_TERMS = ['monitoramento', 'sensor', 'rastreamento', 'controle', 'sistema']
+
+SCENARIOS = ('list', 'detail', 'stats', 'history', 'search', 'create', 'update', 'delete', 'static')
+
+
+def seed(database_url, projects, history_average, seed_value):
+    """Popula o banco temporário com o gerador de dados (src/generate.py)"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    with app.app_context():
+        generate(projects, history_average=history_average, seed=seed_value, reset=True,
+                 until=datetime(2025, 1, 1))
+        db.engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, database_url, port, workers, no_cache):
+    # Sem reciclagem de workers durante a medição (reprodutibilidade); métricas
+    # no diretório temporário do banco (não mistura com um servidor em execução)
+    env = dict(os.environ, DATABASE_URL=database_url, GUNICORN_MAX_REQUESTS='0',
+               METRICS_DIR=os.path.join(os.path.dirname(database_url[len('sqlite:///'):]), 'metrics'))
+    if no_cache:
+        env['RESPONSE_CACHE_ENTRIES'] = '0'
+    if kind == 'gunicorn':
+        command = [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+            '--access-logfile', os.devnull, '--log-level', 'warning',
+        ]
+    else:
+        command = [
+            sys.executable, '-c',
+            'from src.main import create_app; '
+            f"create_app().run(host='127.0.0.1', port={port}, threaded=True)",
+        ]
+    process = subprocess.Popen(command, cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'❌ Servidor {kind} terminou ao iniciar (código {process.returncode})')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/projects/stats')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f'❌ Servidor {kind} não respondeu em 60s')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def make_requests(scenario, projects):
+    """Gerador de (método, caminho, corpo) para um cenário"""
+    # Exclusões usam ids distintos, do fim para o começo (não colidem com
+    # os ids mais usados pelos outros cenários)
+    deletable = itertools.count(projects, -1)
+    lock = threading.Lock()
+
+    def next_request():
+        project_id = random.randint(1, max(projects // 2, 1))
+        if scenario == 'list':
+            return 'GET', f'/api/projects?limit=50&category={random.choice(CATEGORIES)}', None
+        if scenario == 'detail':
+            return 'GET', f'/api/projects/{project_id}', None
+        if scenario == 'stats':
+            return 'GET', '/api/projects/stats?groupBy=category,priority', None
+        if scenario == 'history':
+            return 'GET', f'/api/projects/{project_id}/history?limit=50', None
+        if scenario == 'search':
+            return 'GET', f'/api/projects/search?q={random.choice(SEARCH_TERMS)}&limit=20', None
+        if scenario == 'create':
+            return 'POST', '/api/projects', {
+                'name': f'Projeto benchmark {random.random():.6f}',
+                'category': random.choice(CATEGORIES),
+                'priority': random.choice(PRIORITIES),
+                'roi': random.randint(0, 100),
+            }
+        if scenario == 'update':
+            return 'PUT', f'/api/projects/{project_id}', {'roi': round(random.uniform(0, 100), 2)}
+        if scenario == 'delete':
+            with lock:
+                target = next(deletable)
+            if target <= projects // 2:
+                return None
+            return 'DELETE', f'/api/projects/{target}', None
+        if scenario == 'static':
+            return 'GET', '/', None
+        raise ValueError(scenario)
+    return next_request
+
+
+def run_scenario(port, scenario, projects, concurrency, duration):
+    next_request = make_requests(scenario, projects)
+    latencies = []
+    statuses = {}
+    errors = 0
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def worker():
+        nonlocal errors
+        local_latencies = []
+        local_statuses = {}
+        local_errors = 0
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while time.monotonic() < stop:
+            request = next_request()
+            if request is None:
+                break
+            method, path, body = request
+            payload = json.dumps(body).encode('utf-8') if body is not None else None
+            headers = {'Content-Type': 'application/json'} if payload else {}
+            started = time.perf_counter()
+            try:
+                try:
+                    connection.request(method, path, body=payload, headers=headers)
+                    response = connection.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Conexão keep-alive fechada pelo servidor: reconecta uma vez
+                    connection.close()
+                    started = time.perf_counter()
+                    connection.request(method, path, body=payload, headers=headers)
+                    response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+            if response.status >= 400:
+                local_errors += 1
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+            errors += local_errors
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, max(0, int(round(p / 100 * len(latencies))) - 1))
+        return round(latencies[index] * 1000, 2)
+
+    return {
+        'scenario': scenario,
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50Ms': percentile(50),
+        'p95Ms': percentile(95),
+        'p99Ms': percentile(99),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(projects, args):
+    directory = tempfile.mkdtemp(prefix='bench-http-')
+    database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    try:
+        random.seed(args.seed)
+        started = time.monotonic()
+        seed(database_url, projects, args.history, args.seed)
+        seed_seconds = time.monotonic() - started
+
+        port = free_port()
+        process = start_server(args.server, database_url, port, args.workers, args.no_cache)
+        try:
+            results = []
+            for scenario in args.scenarios:
+                # Aquecimento curto: caches, pool de conexões, páginas do SQLite
+                run_scenario(port, scenario if scenario != 'delete' else 'detail', projects, 1, 0.5)
+                results.append(run_scenario(port, scenario, projects, args.concurrency, args.duration))
+        finally:
+            stop_server(process)
+        return {'projects': projects, 'seedSeconds': round(seed_seconds, 1), 'results': results}
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--projects', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--history', type=float, default=5, help='média de revisões de histórico por projeto')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5, help='segundos por cenário')
+    parser.add_argument('--server', choices=['gunicorn', 'dev'], default='gunicorn')
+    parser.add_argument('--workers', type=int, default=2, help='workers do gunicorn')
+    parser.add_argument('--no-cache', action='store_true', help='desativa o cache de respostas')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'server': args.server,
+        'workers': args.workers if args.server == 'gunicorn' else 1,
+        'concurrency': args.concurrency,
+        'durationSeconds': args.duration,
+        'responseCache': not args.no_cache,
+        'runs': [benchmark(projects, args) for projects in args.projects],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
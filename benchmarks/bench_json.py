@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização JSON das listas de projetos
+
+Serializa 1k/10k/100k projetos como a rota ``GET /api/projects`` faz
+(``jsonify`` de uma lista de dicts) com:
+
+- ``flask-default``: provider padrão do Flask (json da stdlib)
+- ``stdlib``: src/json_provider.py forçado para a stdlib
+- ``orjson``: src/json_provider.py com orjson, dicts de ``to_dict()``
+- ``orjson-native``: orjson recebendo ``datetime`` sem ``isoformat()``
+
+Os tempos incluem a montagem dos dicts. Não usa banco.
+
+Uso:
+    python benchmarks/bench_json.py --sizes 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from src.json_provider import FastJSONProvider, orjson
+from src.models.project import Project
+
+CATEGORIES = ['sensores', 'rastreabilidade', 'inovacao']
+PRIORITIES = ['alta', 'média', 'baixa']
+
+
+def make_projects(count):
+    start = datetime(2025, 1, 1)
+    return [Project(
+        id=i + 1,
+        name=f'Projeto {i}',
+        description='Projeto gerado para benchmark de serialização',
+        category=random.choice(CATEGORIES),
+        current_stage=random.randint(1, 5),
+        priority=random.choice(PRIORITIES),
+        roi=random.uniform(0, 100),
+        effort=random.randint(10, 500),
+        budget=random.randint(1000, 100000),
+        created_at=start + timedelta(minutes=i),
+        updated_at=start + timedelta(minutes=i, seconds=30),
+    ) for i in range(count)]
+
+
+def native_dict(project):
+    """Como ``to_dict``, mas deixando as datas para o provider"""
+    return {
+        'id': project.id,
+        'name': project.name,
+        'description': project.description,
+        'category': project.category,
+        'currentStage': project.current_stage,
+        'priority': project.priority,
+        'roi': project.roi,
+        'effort': project.effort,
+        'budget': project.budget,
+        'createdAt': project.created_at,
+        'updatedAt': project.updated_at,
+    }
+
+
+def make_app(provider_class, backend='auto'):
+    app = Flask(__name__)
+    app.config['JSON_BACKEND'] = backend
+    app.json = provider_class(app) if provider_class is FastJSONProvider else DefaultJSONProvider(app)
+    return app
+
+
+def measure(app, projects, to_dict, repeat):
+    best = None
+    size = 0
+    with app.app_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = app.json.response([to_dict(project) for project in projects])
+            elapsed = time.perf_counter() - started
+            size = len(response.get_data())
+            best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    variants = [
+        ('flask-default', make_app(DefaultJSONProvider), Project.to_dict),
+        ('stdlib', make_app(FastJSONProvider, 'stdlib'), Project.to_dict),
+    ]
+    if orjson is not None:
+        variants += [
+            ('orjson', make_app(FastJSONProvider, 'orjson'), Project.to_dict),
+            ('orjson-native', make_app(FastJSONProvider, 'orjson'), native_dict),
+        ]
+    else:
+        print('⚠️  orjson não instalado: medindo só a stdlib', file=sys.stderr)
+
+    random.seed(42)
+    results = []
+    for count in args.sizes:
+        projects = make_projects(count)
+        baseline = None
+        for label, app, to_dict in variants:
+            seconds, size = measure(app, projects, to_dict, args.repeat)
+            baseline = baseline or seconds
+            results.append({
+                'projects': count,
+                'provider': label,
+                'ms': round(seconds * 1000, 2),
+                'bytes': size,
+                'speedup': round(baseline / seconds, 2),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
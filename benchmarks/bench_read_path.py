@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark da leitura das listagens: ORM x tuplas do Core
+
+Cria um banco temporário com N projetos (e N linhas de histórico para um
+projeto) e mede, para a listagem de projetos e para o histórico:
+
+- ``orm``: ``Model.query.all()`` + ``to_dict()`` por linha (caminho antigo)
+- ``core``: ``select`` das colunas + dicts montados das tuplas (caminho das
+  rotas em src/routes/project_new.py)
+
+Para cada um mede o tempo de CPU e o pico de memória (tracemalloc) da
+consulta até a lista de dicts, e também com a serialização JSON da resposta.
+
+Uso:
+    python benchmarks/bench_read_path.py --rows 50000 --repeat 3
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from src.main import create_app
+from src.models.project import db, Project, ProjectHistory
+from src.routes.project_new import HISTORY_COLUMNS, PROJECT_COLUMNS, _history_rows, _project_rows
+
+CATEGORIES = ['sensores', 'rastreabilidade', 'inovacao']
+PRIORITIES = ['alta', 'média', 'baixa']
+
+
+def seed(count):
+    start = datetime(2025, 1, 1)
+    db.session.execute(Project.__table__.insert(), [{
+        'name': f'Projeto {i}',
+        'description': 'Projeto gerado para benchmark',
+        'category': random.choice(CATEGORIES),
+        'current_stage': random.randint(1, 5),
+        'priority': random.choice(PRIORITIES),
+        'roi': random.uniform(0, 100),
+        'effort': random.randint(10, 500),
+        'budget': random.randint(1000, 100000),
+        'created_at': start + timedelta(minutes=i),
+        'updated_at': start + timedelta(minutes=i),
+    } for i in range(count)])
+    db.session.execute(ProjectHistory.__table__.insert(), [{
+        'project_id': 1,
+        'revision': i + 1,
+        'is_checkpoint': i % 10 == 0,
+        'changed_fields': 'roi',
+        'roi': random.uniform(0, 100),
+        'changed_at': start + timedelta(minutes=i),
+    } for i in range(count)])
+    db.session.commit()
+
+
+def orm_projects():
+    return [project.to_dict() for project in Project.query.order_by(Project.id).all()]
+
+
+def core_projects():
+    return _project_rows(select(*PROJECT_COLUMNS.values()).order_by(Project.id))
+
+
+def orm_history():
+    return [h.to_dict() for h in ProjectHistory.query.filter_by(project_id=1).order_by(
+        ProjectHistory.changed_at.desc(), ProjectHistory.id.desc()
+    ).all()]
+
+
+def core_history():
+    return _history_rows(select(*HISTORY_COLUMNS.values()).where(ProjectHistory.project_id == 1).order_by(
+        ProjectHistory.changed_at.desc(), ProjectHistory.id.desc()
+    ))
+
+
+def measure(app, read, serialize, repeat):
+    """Melhor tempo de CPU e maior pico de memória entre as repetições"""
+    best_cpu = None
+    peak = 0
+    for _ in range(repeat):
+        # Sessão limpa a cada rodada: o identity map não pode ajudar o ORM
+        db.session.remove()
+        gc.collect()
+        tracemalloc.start()
+        started = time.process_time()
+        rows = read()
+        if serialize:
+            app.json.response(rows)
+        cpu = time.process_time() - started
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best_cpu = cpu if best_cpu is None else min(best_cpu, cpu)
+        del rows
+    return best_cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='bench-read-')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(directory, 'bench.db')}"})
+    results = []
+    try:
+        with app.app_context():
+            random.seed(42)
+            seed(args.rows)
+            for endpoint, orm, core in (('projects', orm_projects, core_projects),
+                                        ('history', orm_history, core_history)):
+                for serialize in (False, True):
+                    measured = {}
+                    for label, read in (('orm', orm), ('core', core)):
+                        measured[label] = measure(app, read, serialize, args.repeat)
+                    for label, (cpu, peak) in measured.items():
+                        results.append({
+                            'endpoint': endpoint,
+                            'rows': args.rows,
+                            'withJson': serialize,
+                            'path': label,
+                            'cpuMs': round(cpu * 1000, 1),
+                            'peakMemoryMB': round(peak / 1024 / 1024, 1),
+                            'cpuSaved': f"{1 - cpu / measured['orm'][0]:.0%}",
+                            'memorySaved': f"{1 - peak / measured['orm'][1]:.0%}",
+                        })
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
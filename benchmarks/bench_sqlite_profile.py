@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark de leitura/escrita concorrente no SQLite: padrão x perfil de produção
+
+Cria um banco temporário com N projetos e roda threads leitoras (busca por id
+e listagem filtrada) em paralelo com threads escritoras (UPDATE + commit),
+primeiro com as configurações padrão do SQLite e depois com o perfil de
+src/sqlite_profile.py (WAL, synchronous=NORMAL, busy_timeout, cache/mmap).
+Com ``--insert-ratio`` parte das escritas vira INSERT de um projeto novo,
+que atualiza todos os índices de ``projects`` (custo de manter os índices).
+
+Uso:
+    python benchmarks/bench_sqlite_profile.py --projects 5000 --readers 6 --writers 2 --seconds 5
+    python benchmarks/bench_sqlite_profile.py --projects 200000 --insert-ratio 1
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.exc import OperationalError
+
+from src.models.project import Project
+from src.sqlite_profile import apply_sqlite_profile, engine_options
+
+CATEGORIES = ['sensores', 'rastreabilidade', 'inovacao']
+PRIORITIES = ['alta', 'média', 'baixa']
+
+
+def project_row(index):
+    now = datetime.utcnow()
+    return {
+        'name': f'Projeto {index}',
+        'description': 'Projeto gerado para benchmark',
+        'category': random.choice(CATEGORIES),
+        'current_stage': random.randint(1, 5),
+        'priority': random.choice(PRIORITIES),
+        'roi': random.uniform(0, 100),
+        'effort': random.randint(10, 500),
+        'budget': random.randint(1000, 100000),
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def seed(engine, count):
+    Project.metadata.create_all(engine, tables=[Project.__table__])
+    rows = [project_row(i) for i in range(count)]
+    with engine.begin() as connection:
+        connection.execute(Project.__table__.insert(), rows)
+
+
+def run(engine, projects, readers, writers, seconds, insert_ratio=0.0):
+    table = Project.__table__
+    counters = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def reader():
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(select(table).where(table.c.id == random.randint(1, projects))).all()
+                    connection.execute(
+                        select(table).where(table.c.category == random.choice(CATEGORIES)).limit(50)
+                    ).all()
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counters['reads'] += done
+            counters['errors'] += errors
+
+    def writer():
+        done = errors = 0
+        while time.monotonic() < stop:
+            try:
+                with engine.begin() as connection:
+                    if random.random() < insert_ratio:
+                        connection.execute(table.insert(), project_row(projects + done))
+                    else:
+                        connection.execute(
+                            update(table)
+                            .where(table.c.id == random.randint(1, projects))
+                            .values(roi=random.uniform(0, 100))
+                        )
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counters['writes'] += done
+            counters['errors'] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'readsPerSecond': round(counters['reads'] / seconds, 1),
+        'writesPerSecond': round(counters['writes'] / seconds, 1),
+        'errors': counters['errors'],
+    }
+
+
+def benchmark(label, tuned, args):
+    directory = tempfile.mkdtemp(prefix='bench-sqlite-')
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    if tuned:
+        engine = create_engine(url, **engine_options())
+        apply_sqlite_profile(engine)
+    else:
+        engine = create_engine(url)
+
+    random.seed(42)
+    seed(engine, args.projects)
+    with engine.connect() as connection:
+        journal = connection.execute(text('PRAGMA journal_mode')).scalar()
+
+    result = run(engine, args.projects, args.readers, args.writers, args.seconds, args.insert_ratio)
+    result.update({'profile': label, 'journalMode': journal})
+    engine.dispose()
+    shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--readers', type=int, default=6)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--insert-ratio', type=float, default=0.0,
+                        help='fração das escritas que insere um projeto novo (0 a 1)')
+    args = parser.parse_args()
+
+    results = [benchmark('default', False, args), benchmark('production', True, args)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
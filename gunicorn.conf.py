@@ -0,0 +1,98 @@
+"""
+Configuração do gunicorn para produção
+
+Uso:
+    gunicorn -c gunicorn.conf.py
+
+Cada worker é um processo separado (usa vários núcleos) com um pool de
+threads para atender requisições de I/O em paralelo. Os workers são
+reciclados após um número de requisições (com jitter, para não reiniciarem
+todos ao mesmo tempo). Um HUP no processo mestre troca os workers sem
+derrubar conexões em andamento, mas com preload_app eles nascem da aplicação
+já carregada no mestre: código novo (deploy) só entra com um restart.
+
+Todas as opções podem ser ajustadas por variáveis de ambiente GUNICORN_*.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+# Aplicação: factory em src/main.py
+wsgi_app = 'src.main:create_app()'
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:53000')
+backlog = int(os.environ.get('GUNICORN_BACKLOG', '2048'))
+
+# Workers: o SQLite serializa as escritas, então além de alguns processos o
+# ganho é pequeno; o padrão é 2 * núcleos + 1 limitado a 8
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+
+# Conexões do stream SSE ficam ociosas numa thread do worker: no máximo
+# metade das threads, para o restante continuar atendendo a API
+os.environ.setdefault('EVENT_STREAM_MAX_SUBSCRIBERS', str(max(threads // 2, 1)))
+
+# Métricas (/api/metrics): cada worker grava as suas neste diretório e
+# qualquer worker soma as de todos ao responder (limpo a cada início)
+metrics_dir = os.environ.setdefault('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'gestao-projetos-metrics'))
+
+# Conexões
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+# Reciclagem gradual dos workers (evita crescimento de memória)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+# Carregar a aplicação no mestre: create_all, índices e pré-compressão rodam
+# uma vez só e os workers nascem com o índice de estáticos pronto. Em troca,
+# o HUP não recarrega o código (o gunicorn reaproveita a aplicação do mestre)
+preload_app = True
+
+# Logs no journal (stdout/stderr)
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+proc_name = 'gestao-projetos'
+
+
+def post_fork(server, worker):
+    """Descarta as conexões SQLite herdadas do mestre.
+
+    Com preload_app o mestre abriu conexões ao criar as tabelas; conexões
+    SQLite não podem ser compartilhadas entre processos, então cada worker
+    começa com o pool vazio (close=False não fecha as do mestre).
+    """
+    from src.models.project import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def on_starting(server):
+    """Começa as métricas do zero a cada início do servidor"""
+    from src.metrics import reset_directory
+
+    reset_directory(metrics_dir)
+
+
+def worker_exit(server, worker):
+    """Grava as métricas do worker antes de ele terminar"""
+    from src.metrics import REGISTRY
+
+    REGISTRY.flush()
+
+
+def child_exit(server, worker):
+    """Incorpora as métricas do worker encerrado ao acumulado (no mestre).
+
+    Assim os contadores não voltam para trás quando um worker é reciclado
+    e o diretório não cresce com um arquivo por worker que já existiu.
+    """
+    from src.metrics import archive_process
+
+    archive_process(metrics_dir, worker.pid)
@@ -184,29 +184,34 @@ def populate_via_api():
     except Exception as e:
         print(f"⚠️  Erro ao verificar projetos existentes: {e}")
     
-    # Criar projetos via API
+    # Criar todos os projetos em uma única requisição (uma transação no banco)
     created_count = 0
     errors = 0
     
-    for project_data in initial_projects:
-        try:
-            response = requests.post(
-                f"{API_BASE}/projects",
-                json=project_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
+    try:
+        response = requests.post(
+            f"{API_BASE}/projects/bulk",
+            json=initial_projects,
+            headers={'Content-Type': 'application/json'},
+            timeout=30
+        )
+        
+        if response.status_code in (201, 207):
+            for result in response.json()['results']:
+                project_name = initial_projects[result['index']]['name']
+                if result['success']:
+                    created_count += 1
+                    print(f"✅ Criado: {project_name}")
+                else:
+                    errors += 1
+                    print(f"❌ Erro ao criar {project_name}: {result['error']}")
+        else:
+            errors = len(initial_projects)
+            print(f"❌ Erro ao criar projetos: {response.text}")
             
-            if response.status_code == 201:
-                created_count += 1
-                print(f"✅ Criado: {project_data['name']}")
-            else:
-                errors += 1
-                print(f"❌ Erro ao criar {project_data['name']}: {response.text}")
-                
-        except Exception as e:
-            errors += 1
-            print(f"❌ Erro ao criar {project_data['name']}: {e}")
+    except Exception as e:
+        errors = len(initial_projects)
+        print(f"❌ Erro ao criar projetos: {e}")
     
     print(f"\n📊 Resultado:")
     print(f"   ✅ Projetos criados: {created_count}")
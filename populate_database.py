@@ -8,8 +8,9 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.main import app
-from src.models.project import db, Project, ProjectHistory
-from datetime import datetime
+from src.models.project import (
+    db, Project, ProjectHistory, ProjectSummary, CollectionVersion, ProjectEvent, ProjectTombstone
+)
 
 def populate_database():
     """Popula o banco de dados com dados de exemplo"""
@@ -107,23 +108,18 @@ def populate_database():
         print("🚀 Iniciando população do banco de dados...")
         
         try:
-            # Criar projetos
+            # Criar projetos pela rota de criação em lote (uma transação que
+            # também atualiza o resumo do portfólio), como em populate_db.py.
+            # A requisição usa a sessão deste contexto: encerrar a leitura
+            # acima para a rota abrir sua própria transação de escrita
+            db.session.rollback()
+            response = app.test_client().post('/api/projects/bulk', json=sample_projects)
+            result = response.get_json()
+            if response.status_code != 201:
+                print(f"❌ Erro ao popular banco de dados: {result}")
+                return False
             for i, project_data in enumerate(sample_projects, 1):
-                project = Project(
-                    name=project_data['name'],
-                    description=project_data['description'],
-                    category=project_data['category'],
-                    current_stage=project_data['currentStage'],
-                    priority=project_data['priority'],
-                    roi=project_data['roi'],
-                    effort=project_data['effort'],
-                    budget=project_data['budget']
-                )
-                db.session.add(project)
-                print(f"  ✅ Projeto {i}/{len(sample_projects)}: {project.name}")
-            
-            # Commit das alterações
-            db.session.commit()
+                print(f"  ✅ Projeto {i}/{len(sample_projects)}: {project_data['name']}")
             
             print(f"\n🎉 Banco de dados populado com sucesso!")
             print(f"   📊 Total de projetos: {Project.query.count()}")
@@ -142,8 +138,19 @@ def clear_database():
     with app.app_context():
         try:
             print("🗑️  Limpando banco de dados...")
+            # Lock de escrita desde o início: o resumo é recalculado na mesma
+            # transação da exclusão, sem escritas do servidor no meio
+            db.session.connection(execution_options={'sqlite_begin': 'IMMEDIATE'})
+            # Tombstones e eventos para que a sincronização incremental e o
+            # stream SSE vejam as exclusões; a nova versão invalida ETags e o
+            # cache de respostas dos workers
+            project_ids = [project_id for (project_id,) in db.session.query(Project.id)]
+            ProjectTombstone.record(project_ids)
+            ProjectEvent.record('deleted', [{'id': project_id} for project_id in project_ids])
             ProjectHistory.query.delete()
             Project.query.delete()
+            ProjectSummary.rebuild()
+            CollectionVersion.bump()
             db.session.commit()
             print("✅ Banco de dados limpo com sucesso!")
             return True
@@ -8,8 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.main import app, db
-from src.models.project import Project
-from datetime import datetime
+from src.models.project import Project, ProjectHistory, ProjectSummary, CollectionVersion, ProjectEvent, ProjectTombstone
 
 # Dados dos projetos iniciais
 initial_projects = [
@@ -163,32 +162,44 @@ def populate_database():
                     print("Operação cancelada.")
                     return
                 
-                # Limpar dados existentes
+                # Limpar dados existentes (com tombstones e eventos, para que
+                # clientes em sincronização incremental e no stream SSE
+                # removam os projetos antigos). Encerra a leitura feita antes
+                # da pergunta e reabre já com o lock de escrita
+                db.session.rollback()
+                db.session.connection(execution_options={'sqlite_begin': 'IMMEDIATE'})
+                project_ids = [project_id for (project_id,) in db.session.query(Project.id)]
+                ProjectTombstone.record(project_ids)
+                ProjectEvent.record('deleted', [{'id': project_id} for project_id in project_ids])
+                ProjectHistory.query.delete()
                 Project.query.delete()
+                ProjectSummary.rebuild()
+                CollectionVersion.bump()
                 db.session.commit()
                 print("✅ Dados existentes removidos.")
             
-            # Inserir projetos iniciais
-            projects_created = 0
-            for project_data in initial_projects:
-                project = Project(
-                    name=project_data['name'],
-                    description=project_data['description'],
-                    category=project_data['category'],
-                    current_stage=project_data['current_stage'],
-                    priority=project_data['priority'],
-                    roi=project_data['roi'],
-                    effort=project_data['effort'],
-                    budget=project_data['budget'],
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                
-                db.session.add(project)
-                projects_created += 1
+            # Inserir projetos iniciais pela rota de criação em lote (uma
+            # transação, mantendo resumo e versão da coleção atualizados)
+            payload = [{
+                'name': project_data['name'],
+                'description': project_data['description'],
+                'category': project_data['category'],
+                'currentStage': project_data['current_stage'],
+                'priority': project_data['priority'],
+                'roi': project_data['roi'],
+                'effort': project_data['effort'],
+                'budget': project_data['budget']
+            } for project_data in initial_projects]
             
-            db.session.commit()
-            print(f"✅ {projects_created} projetos criados com sucesso!")
+            # A requisição usa a sessão deste contexto: encerrar a leitura
+            # acima para a rota abrir sua própria transação de escrita
+            db.session.rollback()
+            response = app.test_client().post('/api/projects/bulk', json=payload)
+            result = response.get_json()
+            if response.status_code != 201:
+                print(f"❌ Erro ao criar projetos: {result}")
+                return
+            print(f"✅ {result['created']} projetos criados com sucesso!")
             
             # Mostrar estatísticas
             sensores_count = Project.query.filter_by(category='sensores').count()
@@ -199,7 +210,7 @@ def populate_database():
             print(f"   ⚙️  Sensores e Monitoramento: {sensores_count} projetos")
             print(f"   📡 Rastreabilidade e Operações: {rastreabilidade_count} projetos")
             print(f"   🚀 Inovação e Projetos Especiais: {inovacao_count} projetos")
-            print(f"   📈 Total: {projects_created} projetos")
+            print(f"   📈 Total: {result['created']} projetos")
             
         except Exception as e:
             db.session.rollback()
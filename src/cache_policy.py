@@ -0,0 +1,49 @@
+"""Política de cache HTTP aplicada a todas as respostas.
+
+- Bundles do Vite com hash no nome (``assets/index-B3bq-AwP.js``) nunca mudam
+  de conteúdo: podem ficar em cache por um ano sem revalidação.
+- Páginas HTML (``index_new.html`` e o fallback da SPA) são revalidadas a cada
+  acesso via ETag/Last-Modified, para que um deploy novo apareça na hora.
+- Rotas da API com ETag são revalidadas (``If-None-Match`` -> 304); as que não
+  emitem ETag continuam sem cache nenhum.
+"""
+import re
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+NO_STORE = 'no-cache, no-store, must-revalidate'
+
+# Nome gerado pelo Vite: <chunk>-<hash de 8 caracteres>.<ext>
+FINGERPRINTED_ASSET = re.compile(
+    r'^/assets/[A-Za-z0-9_.]+-[A-Za-z0-9_-]{8}\.(?:js|css|woff2?|ttf|png|jpe?g|gif|svg|webp|ico)$'
+)
+
+
+def is_fingerprinted(path):
+    """Indica se o caminho é um asset com hash de conteúdo no nome"""
+    return FINGERPRINTED_ASSET.match(path) is not None
+
+
+def cache_control_for(path, response):
+    """Escolhe o Cache-Control adequado para a resposta de ``path``"""
+    if path.startswith('/api/'):
+        return REVALIDATE if response.get_etag()[0] else NO_STORE
+    if response.status_code in (200, 304) and is_fingerprinted(path):
+        return IMMUTABLE
+    if response.status_code >= 400:
+        return NO_STORE
+    return REVALIDATE
+
+
+def apply_cache_policy(path, response):
+    """Define os headers de cache da resposta conforme a política acima"""
+    cache_control = cache_control_for(path, response)
+    response.headers['Cache-Control'] = cache_control
+    if cache_control == NO_STORE:
+        # Headers para resolver problemas de cache com React (proxies antigos)
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    else:
+        response.headers.pop('Pragma', None)
+        response.headers.pop('Expires', None)
+    return response
@@ -0,0 +1,116 @@
+"""Distribuição dos eventos de projetos para os clientes do stream SSE.
+
+Cada processo tem um único ``EventBroker``. Enquanto houver assinantes, uma
+thread lê o log ``project_events`` a partir do último id visto e repassa os
+eventos para a fila de cada assinante. Como a fonte é o banco, eventos
+gravados por outros workers do gunicorn também chegam; no próprio processo,
+``notify()`` após o commit acorda a thread na hora em vez de esperar o
+próximo ciclo de leitura.
+
+A thread só existe enquanto alguém está conectado: com ``preload_app`` o
+broker é criado no mestre, mas a thread nasce depois do fork, no worker.
+"""
+import queue
+import threading
+
+from src.models.project import ProjectEvent
+
+# Máximo de eventos lidos do log por ciclo da thread
+BATCH_SIZE = 500
+
+
+class Subscription:
+    """Fila de eventos de um cliente conectado.
+
+    Se o cliente não consome rápido o bastante e a fila enche, a assinatura
+    é encerrada (``closed``): o cliente reconecta com ``Last-Event-ID`` e
+    recupera o que perdeu pelo log.
+    """
+
+    def __init__(self, size):
+        self.queue = queue.Queue(maxsize=size)
+        self.closed = False
+
+    def get(self, timeout):
+        """Próximo evento; lança queue.Empty quando nada chega no intervalo"""
+        return self.queue.get(timeout=timeout)
+
+
+class EventBroker:
+    """Lê o log de eventos e distribui as mensagens aos assinantes"""
+
+    def __init__(self, app, poll_interval=1.0, max_subscribers=32, queue_size=1000):
+        self.app = app
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._last_id = 0
+
+    def subscribe(self):
+        """Registra um assinante; None quando o limite de conexões foi atingido"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.queue_size)
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                # Ponto de partida lido antes de liberar o assinante: o que
+                # vier depois chega pela fila, o que veio antes pelo log
+                with self.app.app_context():
+                    self._last_id = ProjectEvent.bounds()[1]
+                self._thread = threading.Thread(target=self._run, name='project-events', daemon=True)
+                self._thread.start()
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+            subscription.closed = True
+
+    def notify(self):
+        """Acorda a thread após um commit com eventos novos"""
+        self._wake.set()
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    messages = [event.to_message() for event in ProjectEvent.since(self._last_id, BATCH_SIZE)]
+            except Exception as e:
+                self.app.logger.warning('Falha ao ler eventos de projetos: %s', e)
+                continue
+            if not messages:
+                continue
+
+            if self._last_id and messages[0]['id'] > self._last_id + 1:
+                # Eventos podados do log antes de serem lidos: os clientes
+                # precisam recarregar a coleção
+                self._publish({'id': messages[0]['id'] - 1, 'event': 'reset', 'data': '{}'})
+            for message in messages:
+                self._publish(message)
+            self._last_id = messages[-1]['id']
+            if len(messages) == BATCH_SIZE:
+                self._wake.set()
+
+    def _publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                self.unsubscribe(subscription)
@@ -0,0 +1,255 @@
+"""Gerador de dados sintéticos em volume (benchmarks e planejamento de capacidade).
+
+Gera projetos e o histórico de alterações no formato delta/checkpoint com
+aleatoriedade reprodutível (``--seed``) e as proporções de categoria,
+prioridade e etapa dos projetos reais cadastrados em ``populate_db.py``.
+
+A gravação é feita pelo Core em lotes (executemany) numa única transação.
+Os índices secundários e os triggers da busca textual são removidos durante
+a carga e recriados no final, o que é bem mais rápido do que mantê-los linha
+a linha; em seguida o índice de busca e o resumo do portfólio são
+reconstruídos e a versão da coleção é incrementada (invalida ETags e caches).
+
+    python -m src.generate --projects 1000000 --history 5 --seed 42
+    python -m src.generate --projects 100000 --database sqlite:////tmp/bench.db --reset
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.project import (
+    db, Project, ProjectHistory, ProjectSummary, CollectionVersion, ProjectEvent, ProjectTombstone,
+    SEARCH_TABLE, SEARCH_TRIGGERS, rebuild_search,
+)
+
+# Proporções dos projetos reais (populate_db.py), com um peso mínimo para os
+# valores que ainda não aparecem lá (prioridade baixa, etapa concluída)
+CATEGORY_WEIGHTS = {'sensores': 5, 'rastreabilidade': 5, 'inovacao': 3}
+PRIORITY_WEIGHTS = {'alta': 10, 'média': 3, 'baixa': 1}
+STAGE_WEIGHTS = {1: 5, 2: 4, 3: 3, 4: 1, 5: 1}
+
+NAME_SUBJECTS = {
+    'sensores': ['Inclinômetro', 'Sensor de carga por eixo', 'Leitor de profundidade de sulco',
+                 'Controle de temperatura', 'Analítico de vídeo de EPI', 'Sensor de vibração',
+                 'Medidor de nível', 'Monitoramento de pressão'],
+    'rastreabilidade': ['Rastreamento indoor', 'Monitoramento do enchimento das caçambas', 'Gestão de pneus',
+                        'Roteirização', 'Torre de controle', 'Rastreamento de veículos',
+                        'Controle de pátio', 'Inventário por RFID'],
+    'inovacao': ['Forkvision', 'IoT para fábrica', 'Migração do servidor', 'Manutenção preditiva',
+                 'Gêmeo digital', 'Visão computacional', 'Automação de relatórios'],
+}
+NAME_QUALIFIERS = ['', ' – Linha 2', ' – Filial Sul', ' da frota', ' para empilhadeiras', ' (piloto)',
+                   ' – Fase 2', ' operacional', ' – Unidade Joinville', ' integrado']
+DESCRIPTION_OPENINGS = ['Sistema de', 'Implementação de', 'Projeto de', 'Plataforma de', 'Solução de']
+DESCRIPTION_TOPICS = ['monitoramento em tempo real', 'controle automático', 'análise preditiva',
+                      'rastreabilidade de ativos', 'redução de custos operacionais',
+                      'segurança dos operadores', 'otimização de rotas', 'integração com o ERP']
+DESCRIPTION_TARGETS = ['dos equipamentos críticos', 'da frota', 'da linha de produção', 'dos pneus',
+                       'das empilhadeiras', 'do almoxarifado', 'das caçambas', 'dos fornecedores']
+
+# Faixas dos projetos reais
+ROI_RANGE = (55, 95)
+EFFORT_RANGE = (60, 260)
+BUDGET_RANGE = (25000, 125000)
+
+# Campo rastreado alterado nas revisões que não são avanço de etapa
+CHANGE_WEIGHTS = {'roi': 3, 'budget': 2, 'effort': 2, 'priority': 1}
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _revision_count(rng, average):
+    """Revisões de um projeto (a criação conta como a primeira)"""
+    if average <= 1:
+        return 1
+    return 1 + min(int(rng.expovariate(1 / (average - 1))), int(average * 10))
+
+
+def _change(rng, state):
+    """Sorteia uma alteração plausível sobre ``state`` (atributo -> valor)"""
+    attribute = _weighted(rng, CHANGE_WEIGHTS)
+    if attribute == 'roi':
+        return {'roi': round(min(100.0, max(0.0, state.roi + rng.uniform(-10, 10))), 1)}
+    if attribute == 'budget':
+        return {'budget': int(state.budget * rng.uniform(0.9, 1.25)) // 100 * 100}
+    if attribute == 'effort':
+        return {'effort': max(10, state.effort + rng.randint(-30, 60))}
+    priorities = [priority for priority in PRIORITY_WEIGHTS if priority != state.priority]
+    return {'priority': rng.choice(priorities)}
+
+
+def generate_rows(rng, first_id, count, history_average, start, end):
+    """Gera ``(linha do projeto, linhas de histórico)`` para cada projeto"""
+    span = (end - start).total_seconds()
+    for project_id in range(first_id, first_id + count):
+        category = _weighted(rng, CATEGORY_WEIGHTS)
+        created_at = start + timedelta(seconds=rng.random() * span)
+        revisions = _revision_count(rng, history_average)
+        # A etapa final segue as proporções reais; parte dela é percorrida
+        # ao longo do histórico, uma etapa por revisão
+        stage = _weighted(rng, STAGE_WEIGHTS)
+        steps = rng.randint(0, min(stage - 1, revisions - 1))
+        state = SimpleNamespace(
+            id=project_id,
+            current_stage=stage - steps,
+            priority=_weighted(rng, PRIORITY_WEIGHTS),
+            roi=round(rng.uniform(*ROI_RANGE), 1),
+            effort=rng.randint(*EFFORT_RANGE),
+            budget=rng.randint(*BUDGET_RANGE) // 1000 * 1000,
+        )
+        history = [ProjectHistory.checkpoint_values(state, 1, created_at)]
+
+        remaining = (end - created_at).total_seconds()
+        moments = sorted(rng.random() * remaining for _ in range(revisions - 1))
+        for revision, offset in enumerate(moments, start=2):
+            pending = revisions - revision + 1
+            if steps and rng.random() < steps / pending:
+                changes = {'current_stage': state.current_stage + 1}
+                steps -= 1
+            else:
+                changes = _change(rng, state)
+            for attribute, value in changes.items():
+                setattr(state, attribute, value)
+            history.append(ProjectHistory.change_values(
+                state, changes, revision, created_at + timedelta(seconds=offset)
+            ))
+
+        project = {
+            'id': project_id,
+            'name': rng.choice(NAME_SUBJECTS[category]) + rng.choice(NAME_QUALIFIERS),
+            'description': ' '.join((rng.choice(DESCRIPTION_OPENINGS), rng.choice(DESCRIPTION_TOPICS),
+                                     rng.choice(DESCRIPTION_TARGETS))),
+            'category': category,
+            'current_stage': state.current_stage,
+            'priority': state.priority,
+            'roi': state.roi,
+            'effort': state.effort,
+            'budget': state.budget,
+            'created_at': created_at,
+            'updated_at': history[-1]['changed_at'],
+        }
+        yield project, history
+
+
+def _secondary_indexes():
+    return [index for model in (Project, ProjectHistory) for index in model.__table__.indexes]
+
+
+def _has_search(connection):
+    return connection.execute(db.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {'name': SEARCH_TABLE}).first() is not None
+
+
+def generate(projects, history_average=5, seed=42, reset=False, days=730, until=None,
+             batch_size=20000, log=None):
+    """Gera e grava ``projects`` projetos no banco da aplicação atual.
+
+    Precisa de um contexto de aplicação. As datas cobrem os ``days`` dias
+    até ``until`` (padrão: início do dia atual), então a mesma seed no mesmo
+    dia gera os mesmos dados. Com ``reset`` apaga os projetos e tabelas
+    derivadas antes; senão acrescenta depois do maior id existente.
+    Retorna um dict com as quantidades e o tempo de cada etapa.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    end = until or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=days)
+    timings = {}
+    history_count = 0
+
+    started = time.monotonic()
+    with db.engine.begin() as connection:
+        search = _has_search(connection)
+        # Índices e triggers fora do caminho da carga
+        for name in SEARCH_TRIGGERS:
+            connection.execute(db.text(f'DROP TRIGGER IF EXISTS {name}'))
+        for index in _secondary_indexes():
+            index.drop(connection, checkfirst=True)
+
+        if reset:
+            for model in (ProjectHistory, Project, ProjectSummary, ProjectEvent, ProjectTombstone):
+                connection.execute(model.__table__.delete())
+        first_id = (connection.execute(db.select(db.func.max(Project.id))).scalar() or 0) + 1
+
+        project_batch = []
+        history_batch = []
+        for project, history in generate_rows(rng, first_id, projects, history_average, start, end):
+            project_batch.append(project)
+            history_batch.extend(history)
+            if len(project_batch) >= batch_size:
+                connection.execute(Project.__table__.insert(), project_batch)
+                connection.execute(ProjectHistory.__table__.insert(), history_batch)
+                history_count += len(history_batch)
+                log(f'   {project["id"] - first_id + 1:,} projetos...')
+                project_batch, history_batch = [], []
+        if project_batch:
+            connection.execute(Project.__table__.insert(), project_batch)
+            connection.execute(ProjectHistory.__table__.insert(), history_batch)
+            history_count += len(history_batch)
+        timings['insertSeconds'] = time.monotonic() - started
+
+        started = time.monotonic()
+        for index in _secondary_indexes():
+            index.create(connection, checkfirst=True)
+        connection.execute(db.text('PRAGMA analysis_limit=1000'))
+        connection.execute(db.text('ANALYZE'))
+        timings['indexSeconds'] = time.monotonic() - started
+
+        if search:
+            started = time.monotonic()
+            rebuild_search(connection)
+            for name, body in SEARCH_TRIGGERS.items():
+                connection.execute(db.text(f'CREATE TRIGGER IF NOT EXISTS {name} {body}'))
+            timings['searchSeconds'] = time.monotonic() - started
+
+    started = time.monotonic()
+    ProjectSummary.rebuild()
+    CollectionVersion.bump()
+    db.session.commit()
+    timings['summarySeconds'] = time.monotonic() - started
+
+    return {
+        'projects': projects,
+        'history': history_count,
+        'firstId': first_id,
+        **{key: round(value, 2) for key, value in timings.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera projetos e histórico sintéticos em volume')
+    parser.add_argument('--projects', type=int, default=100000)
+    parser.add_argument('--history', type=float, default=5, help='média de revisões por projeto')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--days', type=int, default=730, help='período coberto pelas datas geradas')
+    parser.add_argument('--until', type=datetime.fromisoformat, help='fim do período (padrão: hoje)')
+    parser.add_argument('--batch-size', type=int, default=20000)
+    parser.add_argument('--database', help='URL SQLAlchemy (padrão: DATABASE_URL ou src/database/app.db)')
+    parser.add_argument('--reset', action='store_true', help='apaga os projetos existentes antes')
+    args = parser.parse_args()
+
+    from src.main import create_app
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database} if args.database else None)
+    with app.app_context():
+        print(f"🏭 Gerando {args.projects:,} projetos (seed {args.seed})...")
+        started = time.monotonic()
+        result = generate(args.projects, args.history, args.seed, args.reset, args.days, args.until,
+                          args.batch_size, log=print)
+        print(f"✅ {result['projects']:,} projetos e {result['history']:,} linhas de histórico "
+              f"em {time.monotonic() - started:.1f}s")
+        print(f"   inserção {result['insertSeconds']}s, índices {result['indexSeconds']}s, "
+              f"busca {result.get('searchSeconds', '-')}s, resumo {result['summarySeconds']}s")
+
+
+if __name__ == '__main__':
+    main()
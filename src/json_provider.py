@@ -0,0 +1,80 @@
+"""Provider JSON da aplicação: orjson quando disponível, senão a stdlib.
+
+``jsonify`` e ``request.get_json`` passam por ``app.json``. Com listas
+grandes a serialização domina o tempo da requisição, e o orjson é bem mais
+rápido que o ``json`` da stdlib; além disso serializa ``datetime`` nativamente
+(ISO 8601, como ``isoformat()``), então quem monta a resposta não precisa
+converter datas antes.
+
+O orjson é opcional: instale o pacote ``orjson`` para ativá-lo. A escolha
+pode ser forçada com ``JSON_BACKEND`` (``auto``, ``orjson`` ou ``stdlib``).
+"""
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+BACKENDS = ('auto', 'orjson', 'stdlib')
+
+
+def _default(value):
+    # Datas em ISO 8601 (o provider padrão do Flask usa o formato HTTP)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` com orjson e datas em ISO 8601"""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        backend = app.config.get('JSON_BACKEND', 'auto')
+        if backend not in BACKENDS:
+            raise ValueError(f'JSON_BACKEND inválido: {backend} (use {", ".join(BACKENDS)})')
+        if backend == 'orjson' and orjson is None:
+            raise RuntimeError('JSON_BACKEND=orjson, mas o pacote orjson não está instalado')
+        self.backend = 'orjson' if backend != 'stdlib' and orjson is not None else 'stdlib'
+
+    def _options(self, indent=False):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj, indent=False):
+        """Serializa ``obj`` direto para bytes UTF-8"""
+        if self.backend == 'orjson':
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options(indent))
+            except TypeError:
+                # Tipos que o orjson recusa (ex.: inteiros com mais de 64
+                # bits) seguem pela stdlib
+                pass
+        if indent:
+            return super().dumps(obj, indent=2).encode('utf-8')
+        return super().dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Mesmo comportamento do provider padrão, sem passar por str
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
@@ -3,78 +3,208 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask, current_app, request
 from flask_cors import CORS
-from src.models.project import db
+from src.cache_policy import apply_cache_policy
+from src.precompress import precompress_static
+from src.static_files import StaticIndex
+from src.events import EventBroker
+from src.json_provider import FastJSONProvider
+from src.metrics import InstrumentedQueuePool, init_metrics
+from src.response_cache import ResponseCache
+from src.sqlite_profile import configure_sqlite, engine_options
+from src.models.project import db, ensure_columns, ensure_indexes, ensure_summary, ensure_history_checkpoints, ensure_search
 from src.models.project import Project, ProjectHistory
 from src.routes.user import user_bp
 from src.routes.project_new import project_bp
+from src.routes.metrics import metrics_bp
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), 'database')
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), 'static')
+
+
+def create_app(config=None):
+    """Cria e configura a aplicação Flask.
+
+    ``config`` sobrescreve as configurações padrão (útil para scripts,
+    benchmarks e testes que usam outro banco, inclusive ``sqlite://`` em
+    memória). Variáveis de ambiente aceitas:
+    ``DATABASE_URL``, ``SECRET_KEY``, ``STATIC_INDEX_REFRESH``,
+    ``EVENT_STREAM_MAX_SUBSCRIBERS``, ``JSON_BACKEND``,
+    ``RESPONSE_CACHE_ENTRIES`` e ``METRICS_DIR``.
+    """
+    app = Flask(__name__, static_folder=STATIC_FOLDER)
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
+
+    # uncomment if you need to use database
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+        'DATABASE_URL', f"sqlite:///{os.path.join(DATABASE_DIR, 'app.db')}"
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLITE_PROFILE'] = {}
+    # STATIC_INDEX_REFRESH: intervalo (s) para detectar deploys sem reiniciar
+    app.config['STATIC_INDEX_REFRESH'] = float(os.environ.get('STATIC_INDEX_REFRESH', '0'))
+    # Stream SSE (/api/projects/stream): cada conexão ocupa uma thread do
+    # worker, por isso o limite por processo e a duração máxima da conexão
+    app.config['EVENT_STREAM_MAX_SUBSCRIBERS'] = int(os.environ.get('EVENT_STREAM_MAX_SUBSCRIBERS', '32'))
+    app.config['EVENT_STREAM_MAX_AGE'] = 300
+    app.config['EVENT_STREAM_HEARTBEAT'] = 15
+    app.config['EVENT_STREAM_POLL_INTERVAL'] = 1.0
+    app.config['EVENT_STREAM_RETRY_MS'] = 3000
+    # Serialização JSON: orjson quando instalado (ver src/json_provider.py)
+    app.config['JSON_BACKEND'] = os.environ.get('JSON_BACKEND', 'auto')
+    # Cache das respostas de leitura (ver src/response_cache.py); 0 desativa
+    app.config['RESPONSE_CACHE_ENTRIES'] = int(os.environ.get('RESPONSE_CACHE_ENTRIES', '256'))
+    app.config['RESPONSE_CACHE_MAX_BYTES'] = 64 * 1024 * 1024
+    app.config['RESPONSE_CACHE_TTL'] = 60.0
+    # Métricas (/api/metrics, ver src/metrics.py): com vários workers cada
+    # processo grava as suas em METRICS_DIR (gunicorn.conf.py define um)
+    app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR')
+    app.config['METRICS_FLUSH_INTERVAL'] = 5.0
+    app.config.update(config or {})
+    # Perfil de produção do SQLite (WAL, PRAGMAs e pool) - ver src/sqlite_profile.py;
+    # o pool mede a espera por conexão para /api/metrics. Calculado depois de
+    # ``config`` porque depende do banco (em memória não usa pool) e pode ser
+    # substituído inteiro por ``config['SQLALCHEMY_ENGINE_OPTIONS']``
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(
+        {'poolclass': InstrumentedQueuePool}, app.config['SQLALCHEMY_DATABASE_URI']
+    ))
+    app.json = FastJSONProvider(app)
+
+    # Configurar CORS para permitir requisições do frontend
+    CORS(app, origins=['*'])
+
+    # Política de cache: assets com hash são imutáveis, HTML e API com ETag são
+    # revalidados e o restante da API não é guardado (ver src/cache_policy.py)
+    @app.after_request
+    def after_request(response):
+        apply_cache_policy(request.path, response)
+
+        # Headers específicos para arquivos JavaScript
+        if response.content_type and 'javascript' in response.content_type:
+            response.headers['Content-Type'] = 'application/javascript; charset=utf-8'
+
+        return response
+
+    if app.config['SQLALCHEMY_DATABASE_URI'].startswith(f"sqlite:///{DATABASE_DIR}"):
+        os.makedirs(DATABASE_DIR, exist_ok=True)
+    db.init_app(app)
+    configure_sqlite(app, db)
+    init_metrics(app, db)
+    with app.app_context():
+        db.create_all()
+        ensure_columns()
+        ensure_indexes()
+        ensure_summary()
+        ensure_history_checkpoints()
+        # Busca textual (FTS5); sem ela /api/projects/search usa LIKE
+        app.config['FULL_TEXT_SEARCH'] = ensure_search()
+
+    register_commands(app)
+
+    if app.config['RESPONSE_CACHE_ENTRIES'] > 0:
+        app.extensions['response_cache'] = ResponseCache(
+            max_entries=app.config['RESPONSE_CACHE_ENTRIES'],
+            max_bytes=app.config['RESPONSE_CACHE_MAX_BYTES'],
+            ttl=app.config['RESPONSE_CACHE_TTL']
+        )
+    app.extensions['event_broker'] = EventBroker(
+        app,
+        poll_interval=app.config['EVENT_STREAM_POLL_INTERVAL'],
+        max_subscribers=app.config['EVENT_STREAM_MAX_SUBSCRIBERS']
+    )
+
+    # Gerar .gz/.br dos arquivos estáticos (só recomprime o que mudou) e montar
+    # o índice em memória usado pelas rotas de arquivos estáticos
+    if app.static_folder:
+        precompress_static(app.static_folder)
+        app.extensions['static_index'] = StaticIndex(
+            app.static_folder,
+            refresh_interval=app.config['STATIC_INDEX_REFRESH']
+        )
+
+    # Registrar blueprints DEPOIS da configuração do banco
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(project_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp, url_prefix='/api')
+
+    app.add_url_rule('/', view_func=serve_root)
+    app.add_url_rule('/<path:path>', view_func=serve_static)
+
+    return app
+
+
+def register_commands(app):
+    """Comandos de manutenção disponíveis via ``flask --app src.main``"""
+
+    @app.cli.command('rebuild-summary')
+    def rebuild_summary():
+        """Recalcula o resumo do portfólio e confere com os dados reais"""
+        from src.models.project import ProjectSummary
+
+        # Transação de escrita desde o início (como ``_begin_write`` nas
+        # rotas): uma leitura promovida a escrita no meio daria SQLITE_BUSY
+        # com o servidor gravando ao mesmo tempo
+        db.session.connection(execution_options={'sqlite_begin': 'IMMEDIATE'})
+        mismatches = ProjectSummary.verify()
+        if mismatches:
+            print(f"⚠️  {len(mismatches)} divergência(s) encontradas no resumo:")
+            for key, stored, live in mismatches:
+                print(f"   {key}: gravado={stored} real={live}")
+        else:
+            print("✅ Resumo consistente com os dados reais")
+
+        ProjectSummary.rebuild()
+        db.session.commit()
+
+        remaining = ProjectSummary.verify()
+        if remaining:
+            raise SystemExit(f"❌ Resumo ainda divergente após reconstrução: {remaining}")
+        print("✅ Resumo reconstruído e verificado")
+
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-
-# Configurar CORS para permitir requisições do frontend
-CORS(app, origins=['*'])
-
-# Configurar headers para resolver problemas de cache React #130
-@app.after_request
-def after_request(response):
-    # Headers para resolver problemas de cache com React
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    
-    # Headers específicos para arquivos JavaScript
-    if response.content_type and 'javascript' in response.content_type:
-        response.headers['Content-Type'] = 'application/javascript; charset=utf-8'
-    
-    return response
-
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
-
-# Registrar blueprints DEPOIS da configuração do banco
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(project_bp, url_prefix='/api')
-
-@app.route('/')
 def serve_root():
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    static_index = current_app.extensions.get('static_index')
+    if static_index is None:
         return "Static folder not configured", 404
 
-    # Usar o novo frontend que resolve o erro React #130
-    index_path = os.path.join(static_folder_path, 'index_new.html')
-    if os.path.exists(index_path):
-        return send_from_directory(static_folder_path, 'index_new.html')
-    else:
-        # Fallback para o index.html original
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    # Usar o novo frontend que resolve o erro React #130 (fallback: index.html)
+    entry = static_index.fallback
+    if entry is None:
+        return "index.html not found", 404
+    return static_index.send(entry)
+
 
-@app.route('/<path:path>')
 def serve_static(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    static_index = current_app.extensions.get('static_index')
+    if static_index is None:
         return "Static folder not configured", 404
 
-    if os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        # Se não for um arquivo estático, retornar o frontend
-        index_path = os.path.join(static_folder_path, 'index_new.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index_new.html')
-        else:
-            return "File not found", 404
+    entry = static_index.lookup(path)
+    if entry is not None:
+        return static_index.send(entry)
+
+    # Bundles antigos ou inexistentes em assets/ não caem no frontend
+    if static_index.is_asset_path(path):
+        return "File not found", 404
+
+    # Se não for um arquivo estático, retornar o frontend
+    entry = static_index.fallback
+    if entry is None:
+        return "File not found", 404
+    return static_index.send(entry)
+
+
+def __getattr__(name):
+    # ``from src.main import app`` continua funcionando para os scripts, mas a
+    # aplicação padrão só é criada quando alguém a importa: quem usa
+    # create_app() com outra configuração não abre o banco padrão
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=53000, debug=False)
+    # Servidor de desenvolvimento; em produção use o gunicorn (gunicorn.conf.py)
+    create_app().run(host='0.0.0.0', port=53000, debug=False)
@@ -0,0 +1,351 @@
+"""Métricas da aplicação no formato texto do Prometheus (``/api/metrics``).
+
+Registra, por endpoint (a regra da rota, ex. ``/api/projects/<int:project_id>``):
+
+- quantidade de requisições por método e status, histograma de latência e
+  de tamanho das respostas;
+- comandos SQL por requisição e tempo gasto neles (eventos do engine);
+- espera para obter uma conexão do pool (``InstrumentedQueuePool``) e
+  estouros de ``pool_timeout``.
+
+Tudo fica em memória no processo, em dicts protegidos por um lock: o custo
+por requisição é algumas somas. Com vários workers do gunicorn uma thread de
+cada processo grava a cada ``METRICS_FLUSH_INTERVAL`` segundos (se algo mudou)
+um snapshot em ``METRICS_DIR/metrics-<pid>.json`` e o
+``/api/metrics`` soma os arquivos de todos. Quando um worker termina, o
+mestre incorpora o arquivo dele em ``metrics-archive.json`` para que os
+contadores não voltem para trás (ver gunicorn.conf.py). Sem ``METRICS_DIR``
+(servidor de desenvolvimento) só o processo atual é considerado.
+"""
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# nome -> (tipo, descrição, buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'Requisições HTTP atendidas', None),
+    'http_request_duration_seconds': ('histogram', 'Tempo de resposta das requisições HTTP', DURATION_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Tamanho do corpo das respostas HTTP', SIZE_BUCKETS),
+    'db_statements_total': ('counter', 'Comandos SQL executados durante requisições', None),
+    'db_statement_seconds_total': ('counter', 'Tempo gasto em comandos SQL durante requisições', None),
+    'db_statements_per_request': ('histogram', 'Comandos SQL por requisição', STATEMENT_BUCKETS),
+    'db_time_per_request_seconds': ('histogram', 'Tempo de SQL por requisição', DURATION_BUCKETS),
+    'db_pool_checkout_wait_seconds': ('histogram', 'Espera para obter uma conexão do pool', WAIT_BUCKETS),
+    'db_pool_timeouts_total': ('counter', 'Checkouts do pool que estouraram o pool_timeout', None),
+}
+
+SNAPSHOT_PREFIX = 'metrics-'
+ARCHIVE_FILE = 'metrics-archive.json'
+LOCK_FILE = 'metrics.lock'
+
+
+class MetricsRegistry:
+    """Contadores e histogramas do processo, agregáveis entre processos"""
+
+    def __init__(self):
+        self.directory = None
+        self.flush_interval = 5.0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # Também chamado no processo filho após um fork: o worker não herda
+        # o que o mestre registrou
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._changed = False
+        self._flusher = None
+
+    def configure(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name, labels=(), value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._changed = True
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # contagem por bucket (+Inf no fim), soma
+                histogram = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+            histogram[0][bisect_left(buckets, value)] += 1
+            histogram[1] += value
+            self._changed = True
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(map(list, labels)), value]
+                             for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(map(list, labels)), list(counts), total]
+                               for (name, labels), (counts, total) in self._histograms.items()],
+            }
+
+    # Agregação entre processos
+
+    def start_flusher(self):
+        """Inicia (uma vez por processo) a thread que grava o snapshot"""
+        if self._flusher is not None or not self.directory:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._changed:
+                self.flush()
+
+    def flush(self):
+        """Grava o snapshot deste processo em METRICS_DIR (troca atômica)"""
+        if not self.directory:
+            return
+        self._changed = False
+        path = os.path.join(self.directory, f'{SNAPSHOT_PREFIX}{os.getpid()}.json')
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.snapshot(), f, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    def collect(self):
+        """Snapshot somado de todos os processos (ou só deste, sem METRICS_DIR)"""
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        with _directory_lock(self.directory, fcntl.LOCK_SH):
+            snapshots = [_read_snapshot(path)
+                         for path in glob.glob(os.path.join(self.directory, f'{SNAPSHOT_PREFIX}*.json'))]
+        return merge_snapshots(snapshot for snapshot in snapshots if snapshot)
+
+
+REGISTRY = MetricsRegistry()
+os.register_at_fork(after_in_child=REGISTRY._reset)
+
+
+class _directory_lock:
+    """flock em METRICS_DIR: leitura compartilhada x arquivamento exclusivo"""
+
+    def __init__(self, directory, mode):
+        self.path = os.path.join(directory, LOCK_FILE)
+        self.mode = mode
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        fcntl.flock(self.file, self.mode)
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_snapshots(snapshots):
+    """Soma contadores e histogramas de vários snapshots"""
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, counts, total in snapshot.get('histograms', []):
+            key = (name, tuple(map(tuple, labels)))
+            current = histograms.get(key)
+            if current is None:
+                histograms[key] = [list(counts), total]
+            else:
+                current[0] = [a + b for a, b in zip(current[0], counts)]
+                current[1] += total
+    return {
+        'counters': [[name, list(map(list, labels)), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(map(list, labels)), counts, total]
+                       for (name, labels), (counts, total) in histograms.items()],
+    }
+
+
+def reset_directory(directory):
+    """Limpa METRICS_DIR ao iniciar o servidor (contadores partem do zero)"""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, f'{SNAPSHOT_PREFIX}*.json*')):
+        os.remove(path)
+
+
+def archive_process(directory, pid):
+    """Incorpora o snapshot de um worker encerrado ao arquivo acumulado"""
+    path = os.path.join(directory, f'{SNAPSHOT_PREFIX}{pid}.json')
+    if not os.path.exists(path):
+        return
+    archive = os.path.join(directory, ARCHIVE_FILE)
+    with _directory_lock(directory, fcntl.LOCK_EX):
+        snapshots = [_read_snapshot(archive) or {}, _read_snapshot(path) or {}]
+        temporary = f'{archive}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(merge_snapshots(snapshots), f, separators=(',', ':'))
+        os.replace(temporary, archive)
+        os.remove(path)
+
+
+# Exposição no formato texto do Prometheus
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=None):
+    pairs = [*labels, *(extra or [])]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+def render(snapshot):
+    """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+    series = {name: [] for name in METRICS}
+    for name, labels, value in snapshot['counters']:
+        series[name].append((labels, value))
+    for name, labels, counts, total in snapshot['histograms']:
+        series[name].append((labels, (counts, total)))
+
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(series[name]):
+            if kind == 'counter':
+                lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(total)}')
+            lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+# Coleta
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede a espera de cada checkout"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            REGISTRY.inc('db_pool_timeouts_total')
+            raise
+        finally:
+            REGISTRY.observe('db_pool_checkout_wait_seconds', (), time.perf_counter() - started)
+
+
+def _endpoint():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def init_metrics(app, db):
+    """Registra a coleta de métricas em ``app`` e no engine de ``db``"""
+    REGISTRY.configure(app.config.get('METRICS_DIR'), app.config.get('METRICS_FLUSH_INTERVAL', 5.0))
+    app.extensions['metrics'] = REGISTRY
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def _measure_response(response):
+        # Status e tempo até a resposta ficar pronta (sem a duração de um
+        # stream); o registro fica no teardown, que roda também com exceções
+        started = g.get('metrics_started')
+        if started is not None:
+            g.metrics_response = (response.status_code, response.content_length,
+                                  time.perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def _record_request(exception):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        measured = g.pop('metrics_response', None)
+        if measured is None or exception is not None:
+            # Exceção não tratada pela view: o Flask responde 500 sem passar
+            # pelo after_request
+            measured = (500, None, time.perf_counter() - started)
+        status, size, elapsed = measured
+        endpoint = (('endpoint', _endpoint()), ('method', request.method))
+        REGISTRY.inc('http_requests_total', endpoint + (('status', str(status)),))
+        REGISTRY.observe('http_request_duration_seconds', endpoint, elapsed)
+        if size is not None:
+            REGISTRY.observe('http_response_size_bytes', endpoint, size)
+
+        statements = g.get('sql_statements', 0)
+        seconds = g.get('sql_seconds', 0.0)
+        REGISTRY.observe('db_statements_per_request', endpoint, statements)
+        REGISTRY.observe('db_time_per_request_seconds', endpoint, seconds)
+        if statements:
+            REGISTRY.inc('db_statements_total', endpoint, statements)
+            REGISTRY.inc('db_statement_seconds_total', endpoint, seconds)
+        REGISTRY.start_flusher()
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['metrics_started'].pop()
+        if has_request_context() and 'sql_statements' in g:
+            g.sql_statements += 1
+            g.sql_seconds += elapsed
+
+    @event.listens_for(engine, 'handle_error')
+    def _execute_failed(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('metrics_started'):
+            connection.info['metrics_started'].pop()
@@ -1,5 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn
+from datetime import datetime, timedelta
 import json
 
 db = SQLAlchemy()
@@ -19,6 +23,27 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Paginação por cursor ordenada por (updated_at, id)
+        db.Index('ix_projects_updated_at_id', 'updated_at', 'id'),
+        # Listagem: um índice por coluna de ordenação. O id (rowid) entra
+        # implicitamente no final de cada índice do SQLite, então a página sai
+        # do índice já na ordem do keyset. Categoria e prioridade (3 valores
+        # cada) não têm índice: filtrar as linhas ao percorrer o índice da
+        # ordenação lê ~3 linhas por linha devolvida, enquanto um índice de
+        # igualdade faria o SQLite buscar por ele e ordenar todas as linhas
+        # filtradas. A etapa também é ordenação; com ela filtrada, id, etapa e
+        # updatedAt saem de índices e as demais ordenações ordenam as linhas
+        # da etapa. Intervalos (roiMin, budgetMax...) usam o índice da coluna.
+        db.Index('ix_projects_stage', 'current_stage'),
+        db.Index('ix_projects_stage_updated_at', 'current_stage', 'updated_at'),
+        db.Index('ix_projects_name', 'name'),
+        db.Index('ix_projects_created_at', 'created_at'),
+        db.Index('ix_projects_roi', 'roi'),
+        db.Index('ix_projects_budget', 'budget'),
+        db.Index('ix_projects_effort', 'effort'),
+    )
+    
     def to_dict(self):
         """Converte o projeto para dicionário"""
         return {
@@ -65,6 +90,15 @@ class Project(db.Model):
         return f'<Project {self.name}>'
 
 class ProjectHistory(db.Model):
+    """Histórico dos campos rastreados de um projeto, codificado em deltas.
+
+    Cada linha guarda o estado *após* uma alteração: linhas delta têm só os
+    campos que mudaram (listados em ``changed_fields``; os demais ficam
+    NULL) e, a cada ``CHECKPOINT_INTERVAL`` revisões, uma linha checkpoint
+    guarda todos os campos. A criação do projeto é sempre um checkpoint
+    (revisão 1). Para reconstruir o estado em um instante basta o checkpoint
+    mais próximo antes dele e os poucos deltas seguintes.
+    """
     __tablename__ = 'project_history'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -75,13 +109,132 @@ class ProjectHistory(db.Model):
     effort = db.Column(db.Integer)
     budget = db.Column(db.Integer)
     changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    revision = db.Column(db.Integer)
+    is_checkpoint = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
+    changed_fields = db.Column(db.String(100))  # ex.: "stage,roi"
     
     project = db.relationship('Project', backref=db.backref('history', lazy=True))
     
+    __table_args__ = (
+        # Histórico de um projeto por data (mais recentes primeiro), usado na
+        # paginação por cursor e na busca do checkpoint/deltas
+        db.Index('ix_project_history_project_changed_desc',
+                 project_id, changed_at.desc(), id.desc()),
+        # Última revisão de cada projeto (próximo número de revisão); única
+        # para que duas escritas com o mesmo número falhem em vez de gravar
+        db.Index('ux_project_history_project_revision', 'project_id', 'revision', unique=True),
+    )
+    
+    # Atributo do projeto -> coluna do histórico
+    TRACKED_FIELDS = {
+        'current_stage': 'stage',
+        'priority': 'priority',
+        'roi': 'roi',
+        'effort': 'effort',
+        'budget': 'budget',
+    }
+    
+    # Um checkpoint completo a cada N revisões
+    CHECKPOINT_INTERVAL = 10
+    
+    @classmethod
+    def checkpoint_values(cls, project, revision, changed_at):
+        """Linha checkpoint com todos os campos rastreados de ``project``"""
+        values = {column: getattr(project, attribute) for attribute, column in cls.TRACKED_FIELDS.items()}
+        values.update({
+            'project_id': project.id,
+            'revision': revision,
+            'is_checkpoint': True,
+            'changed_fields': ','.join(cls.TRACKED_FIELDS.values()),
+            'changed_at': changed_at,
+        })
+        return values
+    
+    @classmethod
+    def change_values(cls, project, changes, revision, changed_at):
+        """Linha de histórico para ``changes`` já aplicadas em ``project``.
+
+        Normalmente um delta só com os campos alterados; vira checkpoint
+        quando a revisão cai no intervalo de checkpoints.
+        """
+        if revision % cls.CHECKPOINT_INTERVAL == 0:
+            return cls.checkpoint_values(project, revision, changed_at)
+        columns = [column for attribute, column in cls.TRACKED_FIELDS.items() if attribute in changes]
+        values = dict.fromkeys(cls.TRACKED_FIELDS.values())
+        values.update({column: changes[attribute] for attribute, column in cls.TRACKED_FIELDS.items()
+                       if attribute in changes})
+        values.update({
+            'project_id': project.id,
+            'revision': revision,
+            'is_checkpoint': False,
+            'changed_fields': ','.join(columns),
+            'changed_at': changed_at,
+        })
+        return values
+    
+    @classmethod
+    def next_revisions(cls, project_ids):
+        """Próximo número de revisão de cada projeto (uma consulta indexada).
+
+        Precisa rodar na transação que grava as revisões, aberta com o lock
+        de escrita (``_begin_write`` nas rotas); senão duas escritas
+        simultâneas recebem o mesmo número e o índice único rejeita uma.
+        """
+        if not project_ids:
+            return {}
+        rows = db.session.execute(
+            db.select(cls.project_id, func.max(cls.revision))
+            .where(cls.project_id.in_(list(project_ids)))
+            .group_by(cls.project_id)
+        ).all()
+        revisions = {project_id: (revision or 0) + 1 for project_id, revision in rows}
+        return {project_id: revisions.get(project_id, 1) for project_id in project_ids}
+    
+    @classmethod
+    def state_at(cls, project_id, moment):
+        """Reconstrói os campos rastreados do projeto no instante ``moment``.
+
+        Parte do checkpoint mais recente até ``moment`` e aplica só os deltas
+        entre ele e ``moment``. Retorna ``(estado, revisão, deltas aplicados)``
+        ou None se o projeto não tinha histórico até essa data.
+        """
+        checkpoint = (
+            cls.query
+            .filter(cls.project_id == project_id, cls.is_checkpoint.is_(True), cls.changed_at <= moment)
+            .order_by(cls.changed_at.desc(), cls.id.desc())
+            .first()
+        )
+        if checkpoint is None:
+            return None
+        
+        state = {column: getattr(checkpoint, column) for column in cls.TRACKED_FIELDS.values()}
+        deltas = (
+            cls.query
+            .filter(
+                cls.project_id == project_id,
+                cls.changed_at >= checkpoint.changed_at,
+                cls.changed_at <= moment,
+                cls.revision > checkpoint.revision,
+            )
+            .order_by(cls.revision)
+            .all()
+        )
+        revision = checkpoint.revision
+        for delta in deltas:
+            for column in (delta.changed_fields or '').split(','):
+                if column:
+                    state[column] = getattr(delta, column)
+            revision = delta.revision
+        return state, revision, len(deltas)
+    
     def to_dict(self):
+        changed = self.changed_fields.split(',') if self.changed_fields else []
         return {
             'id': self.id,
             'projectId': self.project_id,
+            'revision': self.revision,
+            'checkpoint': bool(self.is_checkpoint),
+            'changedFields': changed,
             'stage': self.stage,
             'priority': self.priority,
             'roi': self.roi,
@@ -92,3 +245,493 @@ class ProjectHistory(db.Model):
     
     def __repr__(self):
         return f'<ProjectHistory {self.project_id}: stage={self.stage}>'
+
+
+class ProjectSummary(db.Model):
+    """Contadores do portfólio mantidos incrementalmente pelas rotas de escrita.
+
+    Uma linha por combinação (categoria, prioridade, etapa), com totais
+    já somados. As estatísticas leem esta tabela, cujo tamanho depende só do
+    número de combinações e não do número de projetos. Valores nulos das
+    dimensões são gravados como '' / 0 para que a chave única funcione.
+    """
+    __tablename__ = 'project_summary'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.String(50), nullable=False, default='')
+    priority = db.Column(db.String(20), nullable=False, default='')
+    current_stage = db.Column(db.Integer, nullable=False, default=0)
+    project_count = db.Column(db.Integer, nullable=False, default=0)
+    budget_sum = db.Column(db.Integer, nullable=False, default=0)
+    roi_sum = db.Column(db.Float, nullable=False, default=0.0)
+    effort_sum = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('category', 'priority', 'current_stage', name='uq_project_summary_key'),
+    )
+    
+    COUNTERS = ('project_count', 'budget_sum', 'roi_sum', 'effort_sum')
+    
+    @staticmethod
+    def snapshot(project):
+        """Extrai de um projeto a chave e as medidas usadas nos contadores"""
+        return {
+            'category': project.category or '',
+            'priority': project.priority or '',
+            'current_stage': project.current_stage or 0,
+            'project_count': 1,
+            'budget_sum': project.budget or 0,
+            'roi_sum': project.roi or 0.0,
+            'effort_sum': project.effort or 0,
+        }
+    
+    @classmethod
+    def apply(cls, snapshot, sign=1):
+        """Soma (sign=1) ou subtrai (sign=-1) um snapshot na sessão atual.
+
+        Usa um upsert atômico, então roda na mesma transação da escrita do
+        projeto e não precisa ler a linha antes.
+        """
+        cls.apply_many([snapshot], sign)
+    
+    @classmethod
+    def apply_many(cls, snapshots, sign=1):
+        """Aplica vários snapshots, agregando por chave antes de gravar"""
+        deltas = {}
+        for snapshot in snapshots:
+            key = (snapshot['category'], snapshot['priority'], snapshot['current_stage'])
+            delta = deltas.setdefault(key, dict.fromkeys(cls.COUNTERS, 0))
+            for counter in cls.COUNTERS:
+                delta[counter] += sign * snapshot[counter]
+        if not deltas:
+            return
+        
+        rows = [
+            {'category': key[0], 'priority': key[1], 'current_stage': key[2], **delta}
+            for key, delta in deltas.items()
+        ]
+        table = cls.__table__
+        statement = sqlite_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['category', 'priority', 'current_stage'],
+            set_={counter: table.c[counter] + statement.excluded[counter] for counter in cls.COUNTERS}
+        )
+        db.session.execute(statement, rows)
+    
+    @classmethod
+    def live_totals(cls):
+        """Recalcula os contadores direto da tabela projects (varredura completa)"""
+        rows = db.session.execute(
+            db.select(
+                func.coalesce(Project.category, '').label('category'),
+                func.coalesce(Project.priority, '').label('priority'),
+                func.coalesce(Project.current_stage, 0).label('current_stage'),
+                func.count(Project.id).label('project_count'),
+                func.coalesce(func.sum(Project.budget), 0).label('budget_sum'),
+                func.coalesce(func.sum(Project.roi), 0.0).label('roi_sum'),
+                func.coalesce(func.sum(Project.effort), 0).label('effort_sum'),
+            ).group_by('category', 'priority', 'current_stage')
+        ).mappings().all()
+        return {
+            (row['category'], row['priority'], row['current_stage']): {c: row[c] for c in cls.COUNTERS}
+            for row in rows
+        }
+    
+    @classmethod
+    def stored_totals(cls):
+        """Contadores atualmente gravados, ignorando combinações zeradas"""
+        return {
+            (row.category, row.priority, row.current_stage): {c: getattr(row, c) for c in cls.COUNTERS}
+            for row in cls.query.all()
+            if row.project_count
+        }
+    
+    @classmethod
+    def verify(cls):
+        """Compara os contadores gravados com os dados reais.
+
+        Retorna a lista de divergências ``(chave, gravado, real)``; lista
+        vazia significa que o resumo está consistente.
+        """
+        live = cls.live_totals()
+        stored = cls.stored_totals()
+        mismatches = []
+        for key in sorted(set(live) | set(stored), key=str):
+            expected = live.get(key)
+            actual = stored.get(key)
+            if expected is None or actual is None or any(
+                abs(expected[c] - actual[c]) > 1e-6 for c in cls.COUNTERS
+            ):
+                mismatches.append((key, actual, expected))
+        return mismatches
+    
+    @classmethod
+    def rebuild(cls):
+        """Recria o resumo a partir da tabela projects (sem commit)"""
+        cls.query.delete()
+        rows = [
+            {'category': key[0], 'priority': key[1], 'current_stage': key[2], **totals}
+            for key, totals in cls.live_totals().items()
+        ]
+        if rows:
+            db.session.execute(cls.__table__.insert(), rows)
+
+class CollectionVersion(db.Model):
+    """Versão de uma coleção, incrementada em toda escrita.
+
+    Serve de base para ETags: consultar a versão é uma leitura por chave
+    primária, bem mais barata do que carregar e serializar a coleção.
+    """
+    __tablename__ = 'collection_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    @classmethod
+    def current(cls, name='projects'):
+        """Versão atual da coleção (0 se ainda não houve escrita)"""
+        version = db.session.execute(
+            db.select(cls.version).where(cls.name == name)
+        ).scalar()
+        return version or 0
+    
+    @classmethod
+    def bump(cls, name='projects'):
+        """Incrementa a versão na transação atual"""
+        statement = sqlite_insert(cls.__table__).values(name=name, version=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'version': cls.__table__.c.version + 1}
+        )
+        db.session.execute(statement)
+
+
+class ProjectEvent(db.Model):
+    """Log limitado dos eventos de projetos (criação, alteração, exclusão).
+
+    Cada escrita grava seus eventos na mesma transação dos dados; o stream
+    SSE lê este log para entregar os eventos (inclusive os de outros workers)
+    e para retomar uma conexão a partir do ``Last-Event-ID``. Só os últimos
+    ``LOG_SIZE`` eventos são mantidos. Os ids são sequenciais (AUTOINCREMENT
+    e escritas serializadas pelo SQLite), então um salto indica eventos
+    descartados.
+    """
+    __tablename__ = 'project_events'
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    LOG_SIZE = 10000
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)  # created, updated, deleted
+    payload = db.Column(db.Text, nullable=False)  # JSON do projeto
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def record(cls, action, projects):
+        """Grava um evento por projeto (dicts de ``to_dict``) na transação atual"""
+        if not projects:
+            return
+        now = datetime.utcnow()
+        db.session.execute(cls.__table__.insert(), [{
+            'project_id': project['id'],
+            'action': action,
+            'payload': json.dumps(project, separators=(',', ':')),
+            'created_at': now,
+        } for project in projects])
+        # Poda pela chave primária: mantém só os últimos LOG_SIZE eventos
+        db.session.execute(cls.__table__.delete().where(
+            cls.id <= db.select(func.max(cls.id)).scalar_subquery() - cls.LOG_SIZE
+        ))
+    
+    @classmethod
+    def bounds(cls):
+        """(menor, maior) id ainda no log; (0, 0) se estiver vazio"""
+        oldest, latest = db.session.execute(db.select(func.min(cls.id), func.max(cls.id))).one()
+        return oldest or 0, latest or 0
+    
+    @classmethod
+    def since(cls, last_id, limit=1000):
+        """Eventos com id maior que ``last_id``, em ordem"""
+        return db.session.execute(
+            db.select(cls).where(cls.id > last_id).order_by(cls.id).limit(limit)
+        ).scalars().all()
+    
+    def to_message(self):
+        """Evento no formato entregue aos assinantes do stream"""
+        return {
+            'id': self.id,
+            'event': self.action,
+            'data': json.dumps({'type': self.action, 'project': json.loads(self.payload)},
+                               separators=(',', ':')),
+        }
+
+
+class ProjectTombstone(db.Model):
+    """Registro de projeto excluído, para a sincronização incremental.
+
+    A exclusão continua removendo a linha de ``projects``; o tombstone
+    permite que ``/projects/changes`` informe os ids excluídos. Tombstones
+    com mais de ``RETENTION`` são descartados: clientes cujo token é mais
+    antigo do que isso precisam de uma sincronização completa.
+    """
+    __tablename__ = 'project_tombstones'
+    
+    RETENTION = timedelta(days=30)
+    
+    project_id = db.Column(db.Integer, primary_key=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    @classmethod
+    def record(cls, project_ids, moment=None):
+        """Grava (ou renova) os tombstones na transação atual"""
+        if not project_ids:
+            return
+        moment = moment or datetime.utcnow()
+        statement = sqlite_insert(cls.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=['project_id'],
+            set_={'deleted_at': statement.excluded.deleted_at}
+        )
+        db.session.execute(statement, [
+            {'project_id': project_id, 'deleted_at': moment} for project_id in project_ids
+        ])
+    
+    @classmethod
+    def discard(cls, project_ids):
+        """Remove tombstones de ids que voltaram a existir (id reaproveitado)"""
+        if project_ids:
+            db.session.execute(cls.__table__.delete().where(cls.project_id.in_(project_ids)))
+    
+    @classmethod
+    def purge(cls, now=None):
+        """Descarta tombstones mais antigos que a retenção"""
+        horizon = (now or datetime.utcnow()) - cls.RETENTION
+        db.session.execute(cls.__table__.delete().where(cls.deleted_at < horizon))
+        return horizon
+
+
+# Busca textual sobre nome e descrição: tabela FTS5 com conteúdo externo
+# (lê o texto de ``projects``, guarda só o índice) mantida por triggers, o que
+# cobre também os INSERT/UPDATE em lote feitos pelo Core. ``remove_diacritics
+# 2`` faz "inclinometro" encontrar "Inclinômetro"; o índice de prefixos acelera
+# a busca enquanto o usuário digita.
+SEARCH_TABLE = 'projects_fts'
+
+SEARCH_TABLE_DDL = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+    "name, description, content='projects', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+SEARCH_TRIGGERS = {
+    'projects_fts_insert': (
+        "AFTER INSERT ON projects BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    'projects_fts_delete': (
+        "AFTER DELETE ON projects BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    'projects_fts_update': (
+        "AFTER UPDATE OF name, description ON projects BEGIN "
+        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        f"INSERT INTO {SEARCH_TABLE}(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+}
+
+
+def ensure_columns():
+    """Adiciona colunas declaradas nos modelos que faltam em tabelas existentes.
+
+    Migração mínima para bancos criados por versões anteriores: só
+    ``ALTER TABLE ... ADD COLUMN``, nunca remove ou altera colunas.
+    """
+    inspector = db.inspect(db.engine)
+    for model in (Project, ProjectHistory):
+        table = model.__table__
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+            with db.engine.begin() as connection:
+                connection.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+
+
+# Índices criados por versões anteriores e que não são mais usados
+OBSOLETE_INDEXES = (
+    'ix_project_history_project_changed_at', 'ix_project_history_project_revision',
+    'ix_projects_category', 'ix_projects_priority', 'ix_projects_category_priority',
+    'ix_projects_category_stage', 'ix_projects_priority_stage', 'ix_projects_category_updated_at',
+    'ix_projects_priority_updated_at', 'ix_projects_category_roi', 'ix_projects_category_budget',
+    'ix_projects_stage_budget',
+)
+
+
+def ensure_indexes():
+    """Cria os índices declarados nos modelos que ainda não existem no banco.
+
+    ``db.create_all()`` só cria índices junto com tabelas novas; bancos já em
+    produção precisam que os índices adicionados depois sejam criados aqui.
+    """
+    inspector = db.inspect(db.engine)
+    existing = {
+        model: {index['name'] for index in inspector.get_indexes(model.__tablename__)}
+        for model in (Project, ProjectHistory)
+    }
+    # A renumeração faz um GROUP BY no histórico inteiro; só é necessária
+    # uma vez, antes de criar o índice único (depois dele não há repetições)
+    if 'ux_project_history_project_revision' not in existing[ProjectHistory]:
+        deduplicate_revisions()
+
+    created = False
+    for model in (Project, ProjectHistory):
+        for index in model.__table__.indexes:
+            if index.name not in existing[model]:
+                index.create(db.engine)
+                created = True
+    if created:
+        analyze()
+    
+    # Índices substituídos por versões mais completas ou que deixaram de servir à listagem
+    with db.engine.begin() as connection:
+        for name in OBSOLETE_INDEXES:
+            connection.execute(db.text(f'DROP INDEX IF EXISTS {name}'))
+
+
+def analyze():
+    """Atualiza as estatísticas do planejador do SQLite (amostragem limitada).
+
+    Sem elas o SQLite prefere o índice do filtro de igualdade e ordena as
+    linhas filtradas; com elas escolhe percorrer o índice da ordenação
+    quando o filtro é pouco seletivo.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as connection:
+        connection.execute(db.text('PRAGMA analysis_limit=1000'))
+        connection.execute(db.text('ANALYZE'))
+
+
+def deduplicate_revisions():
+    """Renumera as revisões dos projetos que têm números repetidos.
+
+    Versões anteriores calculavam a próxima revisão fora do lock de escrita
+    e PUTs simultâneos podiam gravar o mesmo número, o que impede criar o
+    índice único. A ordem original (revisão, data, id) é mantida; o estado
+    continua reconstruível porque os checkpoints são marcados em
+    ``is_checkpoint`` e não deduzidos do número.
+    """
+    duplicated = (
+        db.select(ProjectHistory.project_id)
+        .where(ProjectHistory.revision.isnot(None))
+        .group_by(ProjectHistory.project_id, ProjectHistory.revision)
+        .having(func.count() > 1)
+    )
+    numbered = (
+        db.select(
+            ProjectHistory.id,
+            func.row_number().over(
+                partition_by=ProjectHistory.project_id,
+                order_by=(ProjectHistory.revision, ProjectHistory.changed_at, ProjectHistory.id)
+            ).label('revision')
+        )
+        .where(ProjectHistory.revision.isnot(None), ProjectHistory.project_id.in_(duplicated))
+        .subquery()
+    )
+    with db.engine.begin() as connection:
+        connection.execute(
+            db.update(ProjectHistory)
+            .where(ProjectHistory.id == numbered.c.id)
+            .values(revision=numbered.c.revision)
+        )
+
+
+def ensure_summary():
+    """Popula o resumo do portfólio quando a tabela acabou de ser criada"""
+    if ProjectSummary.query.first() is None and Project.query.first() is not None:
+        ProjectSummary.rebuild()
+        db.session.commit()
+
+
+def ensure_search():
+    """Cria o índice de busca textual e seus triggers, se ainda não existem.
+
+    Devolve False quando o banco não é SQLite ou o SQLite não tem FTS5; nesse
+    caso a busca usa LIKE (sem ranking nem insensibilidade a acentos).
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    with db.engine.begin() as connection:
+        exists = connection.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {'name': SEARCH_TABLE}).first()
+        if exists is None:
+            try:
+                connection.execute(db.text(SEARCH_TABLE_DDL))
+            except OperationalError:
+                return False
+            rebuild_search(connection)
+        for name, body in SEARCH_TRIGGERS.items():
+            connection.execute(db.text(f'CREATE TRIGGER IF NOT EXISTS {name} {body}'))
+    return True
+
+
+def rebuild_search(connection):
+    """Reindexa todos os projetos a partir da tabela ``projects``"""
+    connection.execute(db.text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+
+
+def ensure_history_checkpoints():
+    """Converte o histórico antigo para o formato delta/checkpoint.
+
+    O formato antigo guardava, a cada PUT, o estado *anterior* completo e
+    não tinha revisão. Para cada projeto ainda sem revisões: grava o estado
+    inicial como checkpoint na data de criação e desloca os valores de cada
+    linha antiga para o estado *posterior* (o da linha seguinte, ou o atual
+    na última), marcando todas como checkpoint. Projetos sem histórico
+    ganham o checkpoint inicial com o estado atual.
+    """
+    pending = db.session.execute(
+        db.select(Project).where(~Project.id.in_(
+            db.select(ProjectHistory.project_id).where(ProjectHistory.revision.isnot(None))
+        ))
+    ).scalars().all()
+    if not pending:
+        return
+    
+    legacy = {}
+    for row in ProjectHistory.query.filter(
+        ProjectHistory.project_id.in_([project.id for project in pending])
+    ).order_by(ProjectHistory.project_id, ProjectHistory.changed_at, ProjectHistory.id):
+        legacy.setdefault(row.project_id, []).append(row)
+    
+    columns = list(ProjectHistory.TRACKED_FIELDS.values())
+    for project in pending:
+        rows = legacy.get(project.id, [])
+        states = [{column: getattr(row, column) for column in columns} for row in rows]
+        states.append({column: getattr(project, attribute)
+                       for attribute, column in ProjectHistory.TRACKED_FIELDS.items()})
+        
+        initial = ProjectHistory(
+            project_id=project.id,
+            changed_at=project.created_at or (rows[0].changed_at if rows else datetime.utcnow()),
+            revision=1,
+            is_checkpoint=True,
+            changed_fields=','.join(columns),
+            **states[0]
+        )
+        db.session.add(initial)
+        for revision, (row, state) in enumerate(zip(rows, states[1:]), start=2):
+            for column, value in state.items():
+                setattr(row, column, value)
+            row.revision = revision
+            row.is_checkpoint = True
+            row.changed_fields = ','.join(columns)
+    
+    db.session.commit()
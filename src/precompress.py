@@ -0,0 +1,97 @@
+"""Pré-compressão dos arquivos estáticos (gzip e, se disponível, brotli).
+
+Gera irmãos ``.gz`` / ``.br`` ao lado de cada arquivo de texto em
+``src/static`` para que o servidor entregue a versão comprimida sem custo por
+requisição. Roda na inicialização da aplicação (só recomprime o que mudou) e
+também pode ser executado manualmente no deploy:
+
+    python -m src.precompress
+
+O brotli é opcional: instale o pacote ``brotli`` para gerar também os ``.br``.
+"""
+import gzip
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+# Extensões de texto que valem a pena comprimir
+COMPRESSIBLE_EXTENSIONS = ('.html', '.js', '.css', '.svg', '.json', '.map', '.txt', '.xml', '.ico')
+
+# Arquivos muito pequenos quase não ganham nada com compressão
+MIN_SIZE = 1024
+
+# Codificações suportadas: nome no Accept-Encoding -> extensão do arquivo
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def _compress_gzip(data):
+    # mtime=0 deixa a saída determinística (mesmo ETag entre deploys)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def available_compressors():
+    """Compressores disponíveis neste ambiente: extensão -> função"""
+    compressors = {'.gz': _compress_gzip}
+    if brotli is not None:
+        compressors['.br'] = _compress_brotli
+    return compressors
+
+
+def is_compressible(path):
+    return path.endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def precompress_static(folder):
+    """Gera/atualiza os irmãos comprimidos de ``folder``.
+
+    Só recomprime quando o arquivo original é mais novo que o comprimido, e
+    descarta o resultado quando ele não fica menor que o original.
+    Retorna a quantidade de arquivos gravados.
+    """
+    compressors = available_compressors()
+    written = 0
+
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            source = os.path.join(root, filename)
+            if not is_compressible(filename):
+                continue
+            stat = os.stat(source)
+            if stat.st_size < MIN_SIZE:
+                continue
+
+            data = None
+            for extension, compress in compressors.items():
+                target = source + extension
+                if os.path.exists(target) and os.stat(target).st_mtime >= stat.st_mtime:
+                    continue
+                if data is None:
+                    with open(source, 'rb') as f:
+                        data = f.read()
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    continue
+
+                # Escrever em arquivo temporário e renomear evita servir um
+                # arquivo pela metade para requisições simultâneas
+                temporary = f'{target}.{os.getpid()}.tmp'
+                with open(temporary, 'wb') as f:
+                    f.write(compressed)
+                os.replace(temporary, target)
+                written += 1
+
+    return written
+
+
+if __name__ == '__main__':
+    static_folder = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), 'static')
+    count = precompress_static(static_folder)
+    print(f"✅ {count} arquivo(s) comprimido(s) em {static_folder}")
@@ -0,0 +1,67 @@
+"""Cache em memória das respostas já serializadas das leituras mais usadas.
+
+Guarda os bytes da resposta (LRU com TTL e limite de tamanho total) por
+versão da coleção + URL. A versão é a linha ``collection_versions``,
+incrementada na mesma transação de toda escrita e lida a cada requisição
+pelo ``conditional_get`` (uma leitura por chave primária). Por isso uma
+escrita feita em outro worker do gunicorn muda a chave na hora e nenhum
+worker serve dados anteriores a ela; no próprio processo as rotas de escrita
+ainda descartam o cache após o commit para liberar a memória.
+
+O TTL é só uma rede de segurança para escritas que não passam pela API
+(scripts que alteram o banco direto sem incrementar a versão).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """LRU de (versão, URL) -> (expira em, status, mimetype, corpo)"""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Corpo em cache para ``key`` ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1:]
+
+    def set(self, key, status, mimetype, body):
+        # Respostas muito grandes expulsariam todo o resto do cache
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, status, mimetype, body)
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key)
+        self._size -= len(entry[3])
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,12 @@
+from flask import Blueprint, Response, current_app
+
+from src.metrics import render
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Métricas de todos os workers no formato texto do Prometheus"""
+    registry = current_app.extensions['metrics']
+    return Response(render(registry.collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
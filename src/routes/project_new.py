@@ -1,19 +1,427 @@
-from flask import Blueprint, request, jsonify
-from src.models.project import db, Project, ProjectHistory
-from datetime import datetime
+from flask import Blueprint, Response, current_app, g, request, jsonify, make_response
+from sqlalchemy import and_, case, column, false, func, insert, literal, literal_column, or_, select, table, union_all, update
+from src.models.project import db, Project, ProjectHistory, ProjectSummary, CollectionVersion, ProjectEvent, ProjectTombstone, SEARCH_TABLE
+from functools import wraps
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+import base64
+import hashlib
+import html
 import json
+import queue
+import re
+import time
 
 project_bp = Blueprint('project', __name__)
 
+# Paginação por cursor (keyset): limite padrão e máximo por página
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Campos aceitos em ``sort`` (prefixo ``-`` para ordem decrescente). O id
+# entra sempre por último no keyset para desempatar valores iguais.
+SORTABLE_FIELDS = {
+    'id': Project.id,
+    'name': Project.name,
+    'currentStage': Project.current_stage,
+    'roi': Project.roi,
+    'effort': Project.effort,
+    'budget': Project.budget,
+    'createdAt': Project.created_at,
+    'updatedAt': Project.updated_at,
+}
+
+# Filtros de igualdade (aceitam lista separada por vírgula) e de intervalo
+EQUALITY_FILTERS = {
+    'category': (Project.category, str),
+    'priority': (Project.priority, str),
+    'currentStage': (Project.current_stage, int),
+}
+RANGE_FILTERS = {
+    'roi': Project.roi,
+    'budget': Project.budget,
+    'effort': Project.effort,
+}
+
+
+def _sort_keys(sort):
+    """Converte o parâmetro sort em colunas do keyset: (coluna, campo, decrescente)"""
+    descending = sort.startswith('-')
+    field = sort[1:] if descending else sort
+    if field not in SORTABLE_FIELDS:
+        raise ValueError(f'Ordenação inválida: {sort}')
+    keys = [(SORTABLE_FIELDS[field], field, descending)]
+    if field != 'id':
+        keys.append((Project.id, 'id', descending))
+    return keys
+
+
+def _apply_filters(query, args):
+    """Aplica os filtros de igualdade e intervalo (``roiMin``, ``budgetMax``...)"""
+    for param, (column, cast) in EQUALITY_FILTERS.items():
+        raw = args.get(param)
+        if raw is None or raw == '':
+            continue
+        try:
+            values = [cast(value.strip()) for value in raw.split(',') if value.strip()]
+        except ValueError:
+            raise ValueError(f'Valor inválido para {param}: {raw}')
+        query = query.filter(column == values[0] if len(values) == 1 else column.in_(values))
+
+    for param, column in RANGE_FILTERS.items():
+        for suffix, op in (('Min', column.__ge__), ('Max', column.__le__)):
+            raw = args.get(param + suffix)
+            if raw is None or raw == '':
+                continue
+            try:
+                query = query.filter(op(float(raw)))
+            except ValueError:
+                raise ValueError(f'Valor inválido para {param}{suffix}: {raw}')
+    return query
+
+
+def _order_by(keys):
+    return [column.desc() if descending else column.asc() for column, _, descending in keys]
+
+
+# Leitura sem ORM nas listagens: só as colunas necessárias, selecionadas com o
+# Core, e dicts montados direto das tuplas (sem identity map, instrumentação
+# nem to_dict por linha). Mesmas chaves de ``to_dict``; as datas seguem como
+# datetime e o provider JSON as serializa em ISO 8601.
+PROJECT_COLUMNS = {
+    'id': Project.id,
+    'name': Project.name,
+    'description': Project.description,
+    'category': Project.category,
+    'currentStage': Project.current_stage,
+    'priority': Project.priority,
+    'roi': Project.roi,
+    'effort': Project.effort,
+    'budget': Project.budget,
+    'createdAt': Project.created_at,
+    'updatedAt': Project.updated_at,
+}
+
+HISTORY_COLUMNS = {
+    'id': ProjectHistory.id,
+    'projectId': ProjectHistory.project_id,
+    'revision': ProjectHistory.revision,
+    'checkpoint': ProjectHistory.is_checkpoint,
+    'changedFields': ProjectHistory.changed_fields,
+    'stage': ProjectHistory.stage,
+    'priority': ProjectHistory.priority,
+    'roi': ProjectHistory.roi,
+    'effort': ProjectHistory.effort,
+    'budget': ProjectHistory.budget,
+    'changedAt': ProjectHistory.changed_at,
+}
+
+
+def _project_rows(statement):
+    """Executa um select de ``PROJECT_COLUMNS`` e devolve os dicts da resposta"""
+    keys = tuple(PROJECT_COLUMNS)
+    return [dict(zip(keys, row)) for row in db.session.execute(statement)]
+
+
+def _history_rows(statement):
+    """Executa um select de ``HISTORY_COLUMNS`` e devolve os dicts da resposta"""
+    keys = tuple(HISTORY_COLUMNS)
+    rows = []
+    for row in db.session.execute(statement):
+        item = dict(zip(keys, row))
+        item['checkpoint'] = bool(item['checkpoint'])
+        item['changedFields'] = item['changedFields'].split(',') if item['changedFields'] else []
+        rows.append(item)
+    return rows
+
+
+def _encode_cursor(sort, row, keys=None):
+    """Gera um cursor opaco a partir dos valores de ordenação do último item"""
+    values = [row[key] for _, key, _ in keys or _sort_keys(sort)]
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps({'s': sort, 'v': values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor, sort, keys=None):
+    """Decodifica um cursor; lança ValueError se for inválido ou de outra ordenação"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = payload['v']
+        cursor_sort = payload.get('s')
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError('Cursor inválido')
+
+    keys = keys or _sort_keys(sort)
+    if cursor_sort != sort or not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError('Cursor não corresponde à ordenação solicitada')
+
+    # Valores adulterados (número ou lista no lugar da data) também são 400
+    try:
+        decoded = []
+        for (column, _, _), value in zip(keys, values):
+            if value is not None and isinstance(column.type, db.DateTime):
+                value = datetime.fromisoformat(value)
+            decoded.append(value)
+    except (TypeError, ValueError):
+        raise ValueError('Cursor inválido')
+    return decoded
+
+
+def _keyset_condition(keys, values):
+    """Monta o filtro "depois de" para um keyset de colunas com direção.
+
+    Equivale a (c1, c2, ...) > (v1, v2, ...) respeitando a direção de cada
+    coluna, de forma que o banco consiga usar o índice correspondente. No
+    SQLite NULL ordena antes de qualquer valor (ASC) e depois de todos (DESC).
+    """
+    (column, _, descending), value = keys[0], values[0]
+    if value is None:
+        comparison = false() if descending else column.isnot(None)
+        tie = column.is_(None)
+    else:
+        comparison = or_(column < value, column.is_(None)) if descending else column > value
+        tie = column == value
+    if len(keys) == 1:
+        return comparison
+    return or_(comparison, and_(tie, _keyset_condition(keys[1:], values[1:])))
+
+
+def _parse_limit(raw):
+    """Valida o parâmetro limit da paginação"""
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError('Parâmetro limit deve ser um número inteiro')
+    if limit < 1:
+        raise ValueError('Parâmetro limit deve ser maior que zero')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def conditional_get(view):
+    """Responde com ETag forte e atende ``If-None-Match`` com 304.
+
+    O ETag combina a versão da coleção de projetos (incrementada em toda
+    escrita) com a URL requisitada. Quando o cliente já tem a versão atual,
+    a resposta 304 sai sem executar a view nem carregar nada pelo ORM.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = g.collection_version = CollectionVersion.current()
+        digest = hashlib.sha1(request.full_path.encode('utf-8')).hexdigest()[:16]
+        etag = f'v{version}-{digest}'
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.set_etag(etag)
+        return response
+    return wrapper
+
+
+def cached_response(view):
+    """Serve a resposta do cache em memória quando a coleção não mudou.
+
+    Usado abaixo de ``conditional_get``, que já leu a versão da coleção: a
+    chave é versão + URL, então uma escrita em qualquer worker invalida as
+    entradas antigas (ver src/response_cache.py). Só respostas 200 entram.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = current_app.extensions.get('response_cache')
+        if cache is None:
+            return view(*args, **kwargs)
+        
+        version = g.get('collection_version')
+        if version is None:
+            version = CollectionVersion.current()
+        key = (version, request.full_path)
+        cached = cache.get(key)
+        if cached is not None:
+            status, mimetype, body = cached
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            cache.set(key, response.status_code, response.mimetype, response.get_data())
+        return response
+    return wrapper
+
+
 @project_bp.route('/projects', methods=['GET'])
+@conditional_get
+@cached_response
 def get_projects():
-    """Retorna todos os projetos como array simples"""
+    """Retorna os projetos.
+
+    Aceita filtros (``category``, ``priority``, ``currentStage``, listas
+    separadas por vírgula; ``roiMin``/``roiMax``, ``budgetMin``/``budgetMax``,
+    ``effortMin``/``effortMax``) e ``sort`` (campo, ``-campo`` para ordem
+    decrescente). Sem parâmetros de paginação devolve um array simples
+    (compatível com o frontend). Com ``limit`` e/ou ``after`` devolve uma
+    página junto com o cursor opaco ``nextCursor`` para a próxima página.
+    """
+    try:
+        paginated = 'limit' in request.args or 'after' in request.args
+        sort = request.args.get('sort', 'id')
+
+        try:
+            keys = _sort_keys(sort)
+            query = _apply_filters(select(*PROJECT_COLUMNS.values()), request.args)
+            if paginated:
+                limit = _parse_limit(request.args.get('limit', DEFAULT_PAGE_SIZE))
+                after = request.args.get('after')
+                cursor_values = _decode_cursor(after, sort) if after else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        if not paginated:
+            if 'sort' in request.args:
+                query = query.order_by(*_order_by(keys))
+            projects_list = _project_rows(query)
+
+            # Retornar array simples para compatibilidade com o frontend
+            return jsonify(projects_list), 200
+
+        if cursor_values is not None:
+            query = query.filter(_keyset_condition(keys, cursor_values))
+        query = query.order_by(*_order_by(keys))
+
+        # Buscar um item a mais para saber se existe próxima página
+        projects_list = _project_rows(query.limit(limit + 1))
+        has_more = len(projects_list) > limit
+        projects_list = projects_list[:limit]
+
+        return jsonify({
+            'success': True,
+            'data': projects_list,
+            'nextCursor': _encode_cursor(sort, projects_list[-1]) if has_more else None,
+            'hasMore': has_more
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Busca textual: peso do nome x descrição no bm25 e tamanho do trecho (tokens)
+SEARCH_WEIGHTS = (10.0, 1.0)
+SEARCH_SNIPPET_TOKENS = 12
+# Marcadores internos do destaque, trocados por <mark> depois do escape HTML
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+
+
+def _match_query(raw):
+    """Converte o texto digitado em uma consulta FTS5 segura.
+
+    Cada palavra vira um termo entre aspas com prefixo (``"inclin"*``) e todas
+    precisam aparecer; operadores e pontuação do usuário são ignorados.
+    """
+    terms = re.findall(r'\w+', raw)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _highlight(text):
+    """Escapa o texto para HTML e marca os trechos encontrados com <mark>"""
+    if text is None:
+        return None
+    escaped = html.escape(text)
+    return escaped.replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+
+
+def _search_statement(raw):
+    """Select paginável da busca: FTS5 com ranking ou LIKE como alternativa"""
+    if current_app.config.get('FULL_TEXT_SEARCH'):
+        fts = table(SEARCH_TABLE, column('rowid'))
+        fts_ref = literal_column(SEARCH_TABLE)
+        matches = select(
+            *PROJECT_COLUMNS.values(),
+            func.bm25(fts_ref, *SEARCH_WEIGHTS).label('score'),
+            func.highlight(fts_ref, 0, HIGHLIGHT_START, HIGHLIGHT_END).label('name_highlight'),
+            func.snippet(fts_ref, 1, HIGHLIGHT_START, HIGHLIGHT_END, '…', SEARCH_SNIPPET_TOKENS).label('snippet'),
+        ).select_from(
+            fts.join(Project.__table__, Project.id == fts.c.rowid)
+        ).where(fts_ref.op('MATCH')(_match_query(raw))).subquery()
+    else:
+        # % e _ digitados são literais, como na busca FTS5
+        escaped = raw.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f'%{escaped}%'
+        matches = select(
+            *PROJECT_COLUMNS.values(),
+            literal(0.0).label('score'),
+            literal(None).label('name_highlight'),
+            literal(None).label('snippet'),
+        ).where(or_(
+            Project.name.ilike(pattern, escape='\\'),
+            Project.description.ilike(pattern, escape='\\'),
+        )).subquery()
+    # bm25: quanto menor, mais relevante; id desempata
+    keys = [(matches.c.score, 'score', False), (matches.c.id, 'id', False)]
+    return matches, keys
+
+
+@project_bp.route('/projects/search', methods=['GET'])
+@conditional_get
+@cached_response
+def search_projects():
+    """Busca projetos por nome e descrição (``q``), mais relevantes primeiro.
+
+    Usa o índice FTS5 (sem diferenciar acentos nem maiúsculas, com prefixo
+    na última palavra digitada ou em qualquer outra) e devolve, em cada item,
+    o destaque do nome e um trecho da descrição com os termos marcados por
+    ``<mark>`` (texto já escapado para HTML). Paginação por cursor com
+    ``limit``/``after``, como em ``GET /projects``.
+    """
     try:
-        projects = Project.query.all()
-        projects_list = [project.to_dict() for project in projects]
+        raw = request.args.get('q', '').strip()
+        sort = f'search:{raw}'
+        try:
+            if not re.search(r'\w', raw):
+                raise ValueError('Informe o termo de busca em q')
+            limit = _parse_limit(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            matches, keys = _search_statement(raw)
+            after = request.args.get('after')
+            cursor_values = _decode_cursor(after, sort, keys) if after else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        query = select(matches)
+        if cursor_values is not None:
+            query = query.where(_keyset_condition(keys, cursor_values))
+        query = query.order_by(*_order_by(keys)).limit(limit + 1)
+        
+        keys_out = tuple(PROJECT_COLUMNS) + ('score', 'nameHighlight', 'snippet')
+        results = []
+        for row in db.session.execute(query):
+            item = dict(zip(keys_out, row))
+            item['highlight'] = {
+                'name': _highlight(item.pop('nameHighlight')),
+                'description': _highlight(item.pop('snippet')),
+            }
+            results.append(item)
+        has_more = len(results) > limit
+        results = results[:limit]
         
-        # Retornar array simples para compatibilidade com o frontend
-        return jsonify(projects_list), 200
+        return jsonify({
+            'success': True,
+            'query': raw,
+            'fullText': bool(current_app.config.get('FULL_TEXT_SEARCH')),
+            'data': results,
+            'nextCursor': _encode_cursor(sort, results[-1], keys) if has_more else None,
+            'hasMore': has_more
+        }), 200
         
     except Exception as e:
         return jsonify({
@@ -21,31 +429,329 @@ def get_projects():
             'error': str(e)
         }), 500
 
+
+# Margem aplicada ao token da sincronização. Toda escrita carimba o horário
+# só depois de obter o lock (``_begin_write``), então a margem cobre o tempo
+# entre o carimbo e o commit e diferenças de relógio entre workers. Itens na
+# margem podem ser reenviados; o cliente apenas os sobrescreve.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _encode_sync_token(moment):
+    payload = json.dumps({'t': moment.isoformat()}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_sync_token(token):
+    """Decodifica o token de ``/projects/changes``; ValueError se for inválido"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['t'])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Token de sincronização inválido')
+
+
+@project_bp.route('/projects/changes', methods=['GET'])
+def get_project_changes():
+    """Sincronização incremental: o que mudou desde ``since``.
+
+    Devolve em ``changed`` os projetos criados ou alterados depois do token
+    (busca pelo índice de ``updated_at``), em ``deleted`` os ids excluídos
+    (tombstones) e em ``token`` o valor a enviar na próxima chamada. Sem
+    ``since``, ou com um token anterior à retenção dos tombstones, a resposta
+    traz ``reset: true`` e a lista completa: o cliente descarta o que tinha.
+    """
+    try:
+        now = datetime.utcnow()
+        since = request.args.get('since')
+        try:
+            since_at = _decode_sync_token(since) if since else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        reset = since_at is None or not (now - ProjectTombstone.RETENTION <= since_at <= now)
+        if reset:
+            projects = _project_rows(select(*PROJECT_COLUMNS.values()).order_by(Project.id))
+            deleted = []
+        else:
+            start = since_at - SYNC_OVERLAP
+            projects = _project_rows(
+                select(*PROJECT_COLUMNS.values())
+                .where(Project.updated_at > start)
+                .order_by(Project.updated_at, Project.id)
+            )
+            deleted = db.session.scalars(
+                select(ProjectTombstone.project_id)
+                .where(ProjectTombstone.deleted_at > start)
+                .order_by(ProjectTombstone.deleted_at)
+            ).all()
+        
+        return jsonify({
+            'success': True,
+            'reset': reset,
+            'changed': projects,
+            'deleted': deleted,
+            'token': _encode_sync_token(now)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _begin_write():
+    """Abre a transação da requisição já com o lock de escrita do banco.
+
+    As rotas que leem a linha atual antes de gravar (deltas do resumo,
+    próxima revisão do histórico) precisam que essa leitura e a escrita
+    fiquem na mesma transação serializada; senão dois workers leem o mesmo
+    estado antigo e aplicam deltas em dobro. Tem que ser o primeiro acesso
+    ao banco da requisição (ver ``sqlite_begin`` em src/sqlite_profile.py).
+    """
+    db.session.connection(execution_options={'sqlite_begin': 'IMMEDIATE'})
+
+
+def _after_commit():
+    """Descarta o cache de respostas deste processo e avisa o stream SSE que
+    há eventos novos no log"""
+    cache = current_app.extensions.get('response_cache')
+    if cache is not None:
+        cache.clear()
+    broker = current_app.extensions.get('event_broker')
+    if broker is not None:
+        broker.notify()
+
+
+def _sse(message):
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {message['data']}\n\n"
+
+
+@project_bp.route('/projects/stream', methods=['GET'])
+def stream_projects():
+    """Stream SSE com os eventos ``created``, ``updated`` e ``deleted``.
+
+    Com ``Last-Event-ID`` (header enviado pelo EventSource ao reconectar, ou
+    ``?lastEventId=``) os eventos perdidos são reenviados a partir do log;
+    se eles já saíram do log é enviado um evento ``reset`` e o cliente deve
+    recarregar ``/api/projects``. A conexão dura no máximo
+    ``EVENT_STREAM_MAX_AGE`` segundos (o EventSource reconecta sozinho) e o
+    número de conexões por processo é limitado: cada uma ocupa uma thread
+    do worker enquanto está aberta.
+    """
+    broker = current_app.extensions.get('event_broker')
+    if broker is None:
+        return jsonify({
+            'success': False,
+            'error': 'Stream de eventos não configurado'
+        }), 404
+    
+    raw_last_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    try:
+        last_id = int(raw_last_id) if raw_last_id else None
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': f'Last-Event-ID inválido: {raw_last_id}'
+        }), 400
+    
+    subscription = broker.subscribe()
+    if subscription is None:
+        response = jsonify({
+            'success': False,
+            'error': 'Limite de conexões do stream atingido'
+        })
+        response.headers['Retry-After'] = '10'
+        return response, 503
+    
+    try:
+        # Assinatura feita antes da leitura do log: nenhum evento fica entre
+        # o backlog e a fila (repetidos são descartados pelo id)
+        oldest, latest = ProjectEvent.bounds()
+        backlog = []
+        reset = False
+        if last_id is None:
+            sent = latest
+        elif last_id > latest or (last_id < oldest - 1):
+            reset = True
+            sent = latest
+        else:
+            backlog = [event.to_message() for event in ProjectEvent.since(last_id, ProjectEvent.LOG_SIZE)]
+            sent = backlog[-1]['id'] if backlog else last_id
+        # A conexão com o banco volta para o pool antes do stream começar
+        db.session.remove()
+    except Exception:
+        broker.unsubscribe(subscription)
+        raise
+    
+    max_age = current_app.config['EVENT_STREAM_MAX_AGE']
+    heartbeat = current_app.config['EVENT_STREAM_HEARTBEAT']
+    retry = current_app.config['EVENT_STREAM_RETRY_MS']
+    
+    def generate():
+        nonlocal sent
+        try:
+            yield f"retry: {retry}\n\n"
+            if reset:
+                yield _sse({'id': sent, 'event': 'reset', 'data': '{}'})
+            for message in backlog:
+                yield _sse(message)
+            
+            deadline = time.monotonic() + max_age
+            while not subscription.closed or not subscription.queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = subscription.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    # Comentário SSE: mantém proxies abertos e detecta
+                    # clientes desconectados
+                    yield ': ping\n\n'
+                    continue
+                if message['event'] != 'reset' and message['id'] <= sent:
+                    continue
+                sent = max(sent, message['id'])
+                yield _sse(message)
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'X-Accel-Buffering': 'no'
+    })
+
+
+# Campos aceitos na criação: chave JSON -> (atributo, tipos aceitos, padrão).
+# null recebe o padrão, como já acontecia com o default das colunas
+PROJECT_FIELDS = {
+    'description': ('description', (str,), ''),
+    'category': ('category', (str,), 'sensores'),
+    'currentStage': ('current_stage', (int,), 1),
+    'priority': ('priority', (str,), 'média'),
+    'roi': ('roi', (int, float), 0),
+    'effort': ('effort', (int, float), 0),
+    'budget': ('budget', (int, float), 0),
+}
+
+# Máximo de itens aceitos por requisição em /projects/bulk
+MAX_BULK_ITEMS = 5000
+
+
+def _project_values(data):
+    """Valida um payload de criação e devolve os valores das colunas.
+
+    Lança ValueError com a mensagem de erro quando o payload é inválido.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Cada projeto deve ser um objeto JSON')
+    name = data.get('name')
+    if not name or not isinstance(name, str):
+        raise ValueError('Nome do projeto é obrigatório')
+
+    values = {'name': name}
+    for key, (attribute, types, default) in PROJECT_FIELDS.items():
+        value = data.get(key)
+        if value is None:
+            value = default
+        elif isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError(f'Valor inválido para {key}: {value!r}')
+        values[attribute] = value
+    return values
+
+
+def _project_changes(data):
+    """Valida um payload de atualização parcial e devolve atributo -> valor.
+
+    Campos desconhecidos são ignorados, como no PUT; null é aceito e grava
+    NULL. Lança ValueError quando um valor tem tipo inválido.
+    """
+    changes = {}
+    if 'name' in data:
+        if not data['name'] or not isinstance(data['name'], str):
+            raise ValueError('Nome do projeto é obrigatório')
+        changes['name'] = data['name']
+    for key, (attribute, types, _) in PROJECT_FIELDS.items():
+        if key not in data:
+            continue
+        value = data[key]
+        if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+            raise ValueError(f'Valor inválido para {key}: {value!r}')
+        changes[attribute] = value
+    return changes
+
+
+def _effective_changes(current, changes):
+    """Filtra ``changes`` para os atributos cujo valor difere de ``current``"""
+    return {
+        attribute: value
+        for attribute, value in changes.items()
+        if getattr(current, attribute) != value
+    }
+
+
+def _tracks_history(changes):
+    return any(attribute in ProjectHistory.TRACKED_FIELDS for attribute in changes)
+
+
+def _bulk_payload():
+    """Lê o corpo de /projects/bulk: array JSON ou NDJSON (um objeto por linha).
+
+    Linhas NDJSON malformadas viram itens inválidos (ValueError) em vez de
+    invalidar o lote inteiro.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(ValueError('Linha NDJSON inválida'))
+        return items
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and isinstance(data.get('projects'), list):
+        data = data['projects']
+    if not isinstance(data, list):
+        raise ValueError('Envie um array de projetos (ou NDJSON)')
+    return data
+
+
 @project_bp.route('/projects', methods=['POST'])
 def create_project():
     """Cria um novo projeto"""
     try:
         data = request.get_json()
         
-        if not data or not data.get('name'):
+        try:
+            values = _project_values(data or {})
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'Nome do projeto é obrigatório'
+                'error': str(e)
             }), 400
         
-        project = Project(
-            name=data['name'],
-            description=data.get('description', ''),
-            category=data.get('category', 'sensores'),
-            current_stage=data.get('currentStage', 1),
-            priority=data.get('priority', 'média'),
-            roi=data.get('roi', 0),
-            effort=data.get('effort', 0),
-            budget=data.get('budget', 0)
-        )
+        # Lock antes de carimbar created_at/updated_at: o horário fica dentro
+        # da transação serializada, coberto pela margem do token de sincronização
+        _begin_write()
+        project = Project(**values)
         
         db.session.add(project)
+        db.session.flush()
+        # Estado inicial: primeiro checkpoint do histórico
+        db.session.add(ProjectHistory(**ProjectHistory.checkpoint_values(project, 1, project.created_at)))
+        ProjectSummary.apply(ProjectSummary.snapshot(project))
+        CollectionVersion.bump()
+        ProjectEvent.record('created', [project.to_dict()])
+        ProjectTombstone.discard([project.id])
         db.session.commit()
+        _after_commit()
         
         return jsonify({
             'success': True,
@@ -59,7 +765,102 @@ def create_project():
             'error': str(e)
         }), 500
 
+@project_bp.route('/projects/bulk', methods=['POST'])
+def bulk_create_projects():
+    """Cria vários projetos em uma única transação.
+
+    Aceita um array JSON (ou ``{"projects": [...]}``) ou NDJSON. Todos os
+    itens são validados antes de gravar; por padrão, se algum for inválido
+    nada é gravado (400). Com ``?partial=true`` os válidos são gravados e a
+    resposta é 207. O resultado traz, para cada item, o id criado ou o erro.
+    """
+    try:
+        try:
+            items = _bulk_payload()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        if not items:
+            return jsonify({
+                'success': False,
+                'error': 'Nenhum projeto enviado'
+            }), 400
+        if len(items) > MAX_BULK_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'Máximo de {MAX_BULK_ITEMS} projetos por requisição'
+            }), 413
+
+        results = []
+        rows = []
+        for index, item in enumerate(items):
+            try:
+                if isinstance(item, ValueError):
+                    raise item
+                rows.append(_project_values(item))
+                results.append({'index': index, 'success': True})
+            except ValueError as e:
+                results.append({'index': index, 'success': False, 'error': str(e)})
+
+        failed = len(items) - len(rows)
+        partial = request.args.get('partial', '').lower() in ('1', 'true', 'sim')
+        if not rows or (failed and not partial):
+            return jsonify({
+                'success': False,
+                'error': f'{failed} projeto(s) inválido(s); nada foi gravado',
+                'results': results
+            }), 400
+
+        # executemany com RETURNING: um único INSERT preparado para o lote,
+        # ids devolvidos na mesma ordem dos parâmetros. O lock vem antes do
+        # carimbo de horário, como em create_project
+        _begin_write()
+        now = datetime.utcnow()
+        for row in rows:
+            row['created_at'] = now
+            row['updated_at'] = now
+        ids = db.session.scalars(
+            insert(Project).returning(Project.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        db.session.execute(insert(ProjectHistory), [
+            ProjectHistory.checkpoint_values(SimpleNamespace(id=project_id, **row), 1, now)
+            for project_id, row in zip(ids, rows)
+        ])
+        ProjectSummary.apply_many([ProjectSummary.snapshot(Project(**row)) for row in rows])
+        CollectionVersion.bump()
+        ProjectEvent.record('created', [
+            Project(id=project_id, **row).to_dict() for project_id, row in zip(ids, rows)
+        ])
+        ProjectTombstone.discard(ids)
+        db.session.commit()
+        _after_commit()
+
+        created = iter(ids)
+        for result in results:
+            if result['success']:
+                result['id'] = next(created)
+
+        return jsonify({
+            'success': failed == 0,
+            'created': len(ids),
+            'failed': failed,
+            'results': results
+        }), 201 if failed == 0 else 207
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @project_bp.route('/projects/<int:project_id>', methods=['GET'])
+@conditional_get
+@cached_response
 def get_project(project_id):
     """Retorna um projeto específico"""
     try:
@@ -74,8 +875,15 @@ def get_project(project_id):
 
 @project_bp.route('/projects/<int:project_id>', methods=['PUT'])
 def update_project(project_id):
-    """Atualiza um projeto existente"""
+    """Atualiza um projeto existente.
+
+    Só grava o que realmente mudou: um PUT sem alterações efetivas não faz
+    commit nem altera ``updatedAt``, e o histórico só recebe uma linha quando
+    algum campo rastreado (etapa, prioridade, ROI, esforço, orçamento) muda.
+    A resposta indica em ``changed`` se houve alteração.
+    """
     try:
+        _begin_write()
         project = Project.query.get_or_404(project_id)
         data = request.get_json()
         
@@ -85,41 +893,44 @@ def update_project(project_id):
                 'error': 'Dados não fornecidos'
             }), 400
         
-        # Criar histórico antes da atualização
-        history = ProjectHistory(
-            project_id=project.id,
-            stage=project.current_stage,
-            priority=project.priority,
-            roi=project.roi,
-            effort=project.effort,
-            budget=project.budget,
-            changed_at=datetime.utcnow()
-        )
-        db.session.add(history)
+        try:
+            changes = _effective_changes(project, _project_changes(data))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        if not changes:
+            return jsonify({
+                'success': True,
+                'changed': False,
+                'data': project.to_dict()
+            }), 200
+        
+        now = datetime.utcnow()
+        previous = ProjectSummary.snapshot(project)
         
         # Atualizar campos
-        if 'name' in data:
-            project.name = data['name']
-        if 'description' in data:
-            project.description = data['description']
-        if 'category' in data:
-            project.category = data['category']
-        if 'currentStage' in data:
-            project.current_stage = data['currentStage']
-        if 'priority' in data:
-            project.priority = data['priority']
-        if 'roi' in data:
-            project.roi = data['roi']
-        if 'effort' in data:
-            project.effort = data['effort']
-        if 'budget' in data:
-            project.budget = data['budget']
-        
-        project.updated_at = datetime.utcnow()
+        for attribute, value in changes.items():
+            setattr(project, attribute, value)
+        
+        if _tracks_history(changes):
+            # Histórico guarda só os campos rastreados que mudaram (delta)
+            revision = ProjectHistory.next_revisions([project.id])[project.id]
+            db.session.add(ProjectHistory(**ProjectHistory.change_values(project, changes, revision, now)))
+        
+        project.updated_at = now
+        ProjectSummary.apply(previous, -1)
+        ProjectSummary.apply(ProjectSummary.snapshot(project))
+        CollectionVersion.bump()
+        ProjectEvent.record('updated', [project.to_dict()])
         db.session.commit()
+        _after_commit()
         
         return jsonify({
             'success': True,
+            'changed': True,
             'data': project.to_dict()
         }), 200
         
@@ -130,17 +941,162 @@ def update_project(project_id):
             'error': str(e)
         }), 500
 
+@project_bp.route('/projects/bulk', methods=['PATCH'])
+def bulk_update_projects():
+    """Atualiza vários projetos em uma única transação.
+
+    Aceita ``[{"id": 1, "currentStage": 3}, ...]`` (alterações por item) ou
+    ``{"ids": [1, 2], "changes": {"priority": "alta"}}`` (mesma alteração
+    para todos). Quando todos os itens têm a mesma alteração ela é aplicada
+    com um único ``UPDATE ... WHERE id IN (...)``. O histórico é gravado em
+    lote e a resposta traz o resultado de cada item (``updated``,
+    ``unchanged``, ``not_found`` ou ``invalid``).
+    """
+    try:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict) and isinstance(data.get('ids'), list):
+            changes = data.get('changes') if isinstance(data.get('changes'), dict) else {}
+            items = [{**changes, 'id': project_id} for project_id in data['ids']]
+        elif isinstance(data, list):
+            items = data
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Envie um array de alterações ou {"ids": [...], "changes": {...}}'
+            }), 400
+
+        if not items:
+            return jsonify({
+                'success': False,
+                'error': 'Nenhuma alteração enviada'
+            }), 400
+        if len(items) > MAX_BULK_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'Máximo de {MAX_BULK_ITEMS} projetos por requisição'
+            }), 413
+
+        results = []
+        pending = {}
+        for index, item in enumerate(items):
+            result = {'index': index, 'id': item.get('id') if isinstance(item, dict) else None}
+            results.append(result)
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError('Cada alteração deve ser um objeto JSON')
+                project_id = item.get('id')
+                if isinstance(project_id, bool) or not isinstance(project_id, int):
+                    raise ValueError('id do projeto é obrigatório')
+                if project_id in pending:
+                    raise ValueError('id repetido no lote')
+                changes = _project_changes(item)
+                if not changes:
+                    raise ValueError('Nenhum campo para atualizar')
+                pending[project_id] = (result, changes)
+            except ValueError as e:
+                result.update({'success': False, 'status': 'invalid', 'error': str(e)})
+
+        # Valores atuais de todos os projetos do lote em uma consulta, para o
+        # histórico e os contadores do resumo (lidos já com o lock de escrita)
+        _begin_write()
+        table = Project.__table__
+        current = {
+            row.id: row for row in db.session.execute(
+                select(table).where(table.c.id.in_(list(pending)))
+            )
+        } if pending else {}
+
+        now = datetime.utcnow()
+        history_rows = []
+        previous_snapshots = []
+        new_snapshots = []
+        updates = []
+        events = []
+        for project_id, (result, requested) in pending.items():
+            row = current.get(project_id)
+            if row is None:
+                result.update({'success': False, 'status': 'not_found', 'error': 'Projeto não encontrado'})
+                continue
+            changes = _effective_changes(row, requested)
+            if not changes:
+                # Nada muda: sem UPDATE, sem histórico e sem alterar updatedAt
+                result.update({'success': True, 'status': 'unchanged'})
+                continue
+            updated = SimpleNamespace(**{**row._asdict(), **changes})
+            if _tracks_history(changes):
+                history_rows.append((updated, changes))
+            previous_snapshots.append(ProjectSummary.snapshot(row))
+            new_snapshots.append(ProjectSummary.snapshot(updated))
+            updates.append((project_id, requested))
+            events.append(Project.to_dict(SimpleNamespace(**{**vars(updated), 'updated_at': now})))
+            result.update({'success': True, 'status': 'updated'})
+
+        if updates:
+            if history_rows:
+                revisions = ProjectHistory.next_revisions([updated.id for updated, _ in history_rows])
+                db.session.execute(insert(ProjectHistory), [
+                    ProjectHistory.change_values(updated, changes, revisions[updated.id], now)
+                    for updated, changes in history_rows
+                ])
+
+            first_changes = updates[0][1]
+            if all(changes == first_changes for _, changes in updates):
+                # Mesma alteração para todos: um único UPDATE baseado em conjunto
+                db.session.execute(
+                    update(Project)
+                    .where(Project.id.in_([project_id for project_id, _ in updates]))
+                    .values(**first_changes, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+            else:
+                # ORM bulk UPDATE por chave primária (executemany)
+                db.session.execute(update(Project), [
+                    {'id': project_id, **changes, 'updated_at': now}
+                    for project_id, changes in updates
+                ])
+
+            ProjectSummary.apply_many(previous_snapshots, -1)
+            ProjectSummary.apply_many(new_snapshots)
+            CollectionVersion.bump()
+            ProjectEvent.record('updated', events)
+            db.session.commit()
+            _after_commit()
+
+        failed = sum(1 for result in results if not result['success'])
+        return jsonify({
+            'success': failed == 0,
+            'updated': len(updates),
+            'failed': failed,
+            'results': results
+        }), 200 if failed == 0 else 207
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @project_bp.route('/projects/<int:project_id>', methods=['DELETE'])
 def delete_project(project_id):
     """Exclui um projeto"""
     try:
+        _begin_write()
         project = Project.query.get_or_404(project_id)
         
         # Deletar histórico relacionado se existir
         ProjectHistory.query.filter_by(project_id=project.id).delete()
         
         db.session.delete(project)
+        ProjectSummary.apply(ProjectSummary.snapshot(project), -1)
+        CollectionVersion.bump()
+        ProjectEvent.record('deleted', [{'id': project.id}])
+        # Tombstone para a sincronização incremental; aproveita para podar
+        # os que passaram da retenção
+        ProjectTombstone.record([project.id])
+        ProjectTombstone.purge()
         db.session.commit()
+        _after_commit()
         
         return jsonify({
             'success': True,
@@ -154,23 +1110,109 @@ def delete_project(project_id):
             'error': str(e)
         }), 500
 
+# Dimensões aceitas em ``groupBy`` nas estatísticas
+STATS_DIMENSIONS = {
+    'category': ProjectSummary.category,
+    'priority': ProjectSummary.priority,
+    'currentStage': ProjectSummary.current_stage,
+}
+
+
+def _stats_aggregates():
+    """Colunas agregadas de cada grupo, somando os contadores do resumo"""
+    count = func.coalesce(func.sum(ProjectSummary.project_count), 0)
+    # nullif evita divisão por zero quando não há projetos no grupo
+    divisor = func.nullif(count, 0)
+    return [
+        count.label('count'),
+        func.coalesce(func.sum(case(
+            (ProjectSummary.current_stage == 5, ProjectSummary.project_count), else_=0
+        )), 0).label('completed'),
+        func.coalesce(func.sum(ProjectSummary.budget_sum), 0).label('total_budget'),
+        func.coalesce(func.sum(ProjectSummary.budget_sum) * 1.0 / divisor, 0).label('avg_budget'),
+        func.coalesce(func.sum(ProjectSummary.roi_sum) / divisor, 0).label('avg_roi'),
+        func.coalesce(func.sum(ProjectSummary.effort_sum), 0).label('total_effort'),
+    ]
+
+
+def _stats_query(dimensions):
+    """Monta uma única consulta com os subtotais de ``dimensions`` (ROLLUP).
+
+    Lê a tabela ``project_summary`` (uma linha por combinação de categoria,
+    prioridade e etapa), então o custo não cresce com o número de projetos.
+    O SQLite não tem ``GROUP BY ROLLUP``; cada nível (todas as dimensões,
+    todas menos a última, ..., total geral) vira um SELECT agrupado e os
+    níveis são unidos com UNION ALL, resolvidos em uma só ida ao banco.
+    """
+    selects = []
+    for level in range(len(dimensions), -1, -1):
+        grouped = dimensions[:level]
+        columns = [
+            (STATS_DIMENSIONS[name] if name in grouped else literal(None)).label(name)
+            for name in dimensions
+        ]
+        query = (
+            select(literal(level).label('level'), *columns, *_stats_aggregates())
+            .where(ProjectSummary.project_count > 0)
+        )
+        if grouped:
+            query = query.group_by(*[STATS_DIMENSIONS[name] for name in grouped])
+        selects.append(query)
+    return selects[0] if len(selects) == 1 else union_all(*selects)
+
+
 @project_bp.route('/projects/stats', methods=['GET'])
+@conditional_get
+@cached_response
 def get_project_stats():
-    """Retorna estatísticas dos projetos"""
+    """Retorna estatísticas dos projetos.
+
+    Com ``groupBy`` (ex.: ``groupBy=category,priority``) inclui em
+    ``breakdown`` os agregados por grupo e os subtotais de cada nível.
+    """
     try:
-        total_projects = Project.query.count()
-        completed_projects = Project.query.filter_by(current_stage=5).count()
-        
-        projects = Project.query.all()
-        avg_roi = sum(p.roi for p in projects) / len(projects) if projects else 0
-        total_budget = sum(p.budget for p in projects)
-        
-        return jsonify({
-            'totalProjects': total_projects,
-            'completedProjects': completed_projects,
-            'avgROI': round(avg_roi, 1),
-            'totalBudget': total_budget
-        }), 200
+        raw_group_by = request.args.get('groupBy', '')
+        dimensions = [name.strip() for name in raw_group_by.split(',') if name.strip()]
+        invalid = [name for name in dimensions if name not in STATS_DIMENSIONS]
+        if invalid or len(set(dimensions)) != len(dimensions):
+            return jsonify({
+                'success': False,
+                'error': f'groupBy inválido: {raw_group_by}'
+            }), 400
+
+        rows = db.session.execute(_stats_query(dimensions)).mappings().all()
+        total = next(row for row in rows if row['level'] == 0)
+
+        stats = {
+            'totalProjects': total['count'],
+            'completedProjects': total['completed'],
+            'avgROI': round(total['avg_roi'], 1),
+            'totalBudget': total['total_budget']
+        }
+
+        if dimensions:
+            breakdown = []
+            for row in sorted(rows, key=lambda r: -r['level']):
+                if row['level'] == 0:
+                    continue
+                # O resumo grava dimensões nulas como '' / 0
+                item = {name: row[name] or None for name in dimensions}
+                item.update({
+                    'subtotal': row['level'] < len(dimensions),
+                    'count': row['count'],
+                    'completed': row['completed'],
+                    'totalBudget': row['total_budget'],
+                    'avgBudget': round(row['avg_budget'], 1),
+                    'avgROI': round(row['avg_roi'], 1),
+                    'totalEffort': row['total_effort']
+                })
+                breakdown.append(item)
+            stats['breakdown'] = {
+                'groupBy': dimensions,
+                'rows': breakdown
+            }
+
+        return jsonify(stats), 200
         
     except Exception as e:
         return jsonify({
@@ -182,6 +1224,7 @@ def get_project_stats():
 def seed_projects():
     """Cria projetos de exemplo"""
     try:
+        _begin_write()
         # Verificar se já existem projetos
         if Project.query.count() > 0:
             return jsonify({
@@ -243,6 +1286,7 @@ def seed_projects():
             }
         ]
         
+        projects = []
         for project_data in sample_projects:
             project = Project(
                 name=project_data['name'],
@@ -255,8 +1299,18 @@ def seed_projects():
                 budget=project_data['budget']
             )
             db.session.add(project)
+            projects.append(project)
         
+        db.session.flush()
+        db.session.execute(insert(ProjectHistory), [
+            ProjectHistory.checkpoint_values(project, 1, project.created_at) for project in projects
+        ])
+        ProjectSummary.apply_many([ProjectSummary.snapshot(project) for project in projects])
+        CollectionVersion.bump()
+        ProjectEvent.record('created', [project.to_dict() for project in projects])
+        ProjectTombstone.discard([project.id for project in projects])
         db.session.commit()
+        _after_commit()
         
         return jsonify({
             'success': True,
@@ -270,22 +1324,200 @@ def seed_projects():
             'error': str(e)
         }), 500
 
+# Keyset do histórico: mais recentes primeiro, id desempata a mesma data
+HISTORY_KEYS = [
+    (ProjectHistory.changed_at, 'changedAt', True),
+    (ProjectHistory.id, 'id', True),
+]
+
+
+def _parse_datetime(raw, param):
+    try:
+        return datetime.fromisoformat(raw.replace('Z', ''))
+    except ValueError:
+        raise ValueError(f'Data inválida para {param}: {raw}')
+
+
 @project_bp.route('/projects/<int:project_id>/history', methods=['GET'])
+@conditional_get
 def get_project_history(project_id):
-    """Retorna histórico de alterações de um projeto"""
+    """Retorna histórico de alterações de um projeto, mais recentes primeiro.
+
+    Linhas delta trazem só os campos listados em ``changedFields`` (os
+    demais vêm null); checkpoints trazem todos. Aceita ``from``/``to``
+    (datas ISO, inclusivas). Com ``limit`` e/ou ``after`` devolve uma página
+    e o cursor ``nextCursor``; sem eles, o array completo.
+    """
+    try:
+        paginated = 'limit' in request.args or 'after' in request.args
+        query = select(*HISTORY_COLUMNS.values()).where(ProjectHistory.project_id == project_id)
+        
+        try:
+            if request.args.get('from'):
+                query = query.filter(ProjectHistory.changed_at >= _parse_datetime(request.args['from'], 'from'))
+            if request.args.get('to'):
+                query = query.filter(ProjectHistory.changed_at <= _parse_datetime(request.args['to'], 'to'))
+            if paginated:
+                limit = _parse_limit(request.args.get('limit', DEFAULT_PAGE_SIZE))
+                after = request.args.get('after')
+                if after:
+                    cursor_values = _decode_cursor(after, 'history', HISTORY_KEYS)
+                    query = query.filter(_keyset_condition(HISTORY_KEYS, cursor_values))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        query = query.order_by(*_order_by(HISTORY_KEYS))
+        if not paginated:
+            history_list = _history_rows(query)
+            
+            return jsonify(history_list), 200
+        
+        history_list = _history_rows(query.limit(limit + 1))
+        has_more = len(history_list) > limit
+        history_list = history_list[:limit]
+        
+        return jsonify({
+            'success': True,
+            'data': history_list,
+            'nextCursor': _encode_cursor('history', history_list[-1], HISTORY_KEYS) if has_more else None,
+            'hasMore': has_more
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# Histórico em lote: limite padrão de revisões por projeto
+DEFAULT_HISTORY_PER_PROJECT = 20
+# Páginas de projetos do histórico em lote (modo filtros)
+PROJECT_ID_KEYS = [(Project.id, 'id', False)]
+
+
+@project_bp.route('/projects/history', methods=['GET'])
+@conditional_get
+def get_projects_history():
+    """Retorna o histórico de vários projetos em uma consulta.
+
+    Os projetos vêm de ``ids`` (lista separada por vírgula, até
+    ``MAX_PAGE_SIZE``) ou dos mesmos filtros de ``GET /projects``; com
+    filtros vêm no máximo ``MAX_PAGE_SIZE`` projetos por página, em ordem de
+    id, e ``nextCursor`` (parâmetro ``after``) traz os seguintes. O limite
+    por projeto (``limit``) é aplicado no banco com ``row_number()`` sobre
+    cada projeto; ``from``/``to`` restringem o período.
+    """
+    try:
+        try:
+            limit = _parse_limit(request.args.get('limit', DEFAULT_HISTORY_PER_PROJECT))
+            raw_ids = request.args.get('ids')
+            if raw_ids:
+                try:
+                    ids = sorted({int(value) for value in raw_ids.split(',') if value.strip()})
+                except ValueError:
+                    raise ValueError(f'Valor inválido para ids: {raw_ids}')
+                if len(ids) > MAX_PAGE_SIZE:
+                    raise ValueError(f'Máximo de {MAX_PAGE_SIZE} projetos por requisição')
+                project_ids = ids
+                has_more = False
+            else:
+                # Página de projetos por keyset no id, como nos ids explícitos
+                query = _apply_filters(select(Project.id), request.args)
+                after = request.args.get('after')
+                if after:
+                    cursor_values = _decode_cursor(after, 'projects', PROJECT_ID_KEYS)
+                    query = query.where(_keyset_condition(PROJECT_ID_KEYS, cursor_values))
+                project_ids = db.session.scalars(
+                    query.order_by(*_order_by(PROJECT_ID_KEYS)).limit(MAX_PAGE_SIZE + 1)
+                ).all()
+                has_more = len(project_ids) > MAX_PAGE_SIZE
+                project_ids = project_ids[:MAX_PAGE_SIZE]
+            
+            conditions = [ProjectHistory.project_id.in_(project_ids)]
+            if request.args.get('from'):
+                conditions.append(ProjectHistory.changed_at >= _parse_datetime(request.args['from'], 'from'))
+            if request.args.get('to'):
+                conditions.append(ProjectHistory.changed_at <= _parse_datetime(request.args['to'], 'to'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        position = func.row_number().over(
+            partition_by=ProjectHistory.project_id,
+            order_by=_order_by(HISTORY_KEYS)
+        ).label('position')
+        ranked = select(*HISTORY_COLUMNS.values(), position).where(*conditions).subquery()
+        rows = _history_rows(
+            select(*[ranked.c[column.key] for column in HISTORY_COLUMNS.values()])
+            .where(ranked.c.position <= limit)
+            .order_by(ranked.c.project_id, ranked.c.position)
+        )
+        
+        grouped = {str(project_id): [] for project_id in project_ids}
+        for history in rows:
+            grouped.setdefault(str(history['projectId']), []).append(history)
+        
+        return jsonify({
+            'success': True,
+            'limit': limit,
+            'data': grouped,
+            'nextCursor': _encode_cursor('projects', {'id': project_ids[-1]}, PROJECT_ID_KEYS)
+                          if has_more else None,
+            'hasMore': has_more
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@project_bp.route('/projects/<int:project_id>/state', methods=['GET'])
+@conditional_get
+def get_project_state(project_id):
+    """Reconstrói os campos rastreados de um projeto em uma data (``?at=``).
+
+    Usa o checkpoint mais próximo antes da data e os deltas seguintes, sem
+    reprocessar o histórico inteiro. Sem ``at`` retorna o estado atual do
+    histórico.
+    """
     try:
-        history = ProjectHistory.query.filter_by(project_id=project_id).order_by(ProjectHistory.changed_at.desc()).all()
-        history_list = [{
-            'id': h.id,
-            'stage': h.stage,
-            'priority': h.priority,
-            'roi': h.roi,
-            'effort': h.effort,
-            'budget': h.budget,
-            'changedAt': h.changed_at.isoformat()
-        } for h in history]
-        
-        return jsonify(history_list), 200
+        raw_at = request.args.get('at')
+        try:
+            moment = _parse_datetime(raw_at, 'at') if raw_at else datetime.utcnow()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        reconstructed = ProjectHistory.state_at(project_id, moment)
+        if reconstructed is None:
+            return jsonify({
+                'success': False,
+                'error': 'Projeto sem histórico até essa data'
+            }), 404
+        
+        state, revision, replayed = reconstructed
+        return jsonify({
+            'projectId': project_id,
+            'at': moment.isoformat(),
+            'revision': revision,
+            'replayedDeltas': replayed,
+            'state': {
+                'currentStage': state['stage'],
+                'priority': state['priority'],
+                'roi': state['roi'],
+                'effort': state['effort'],
+                'budget': state['budget']
+            }
+        }), 200
         
     except Exception as e:
         return jsonify({
@@ -0,0 +1,154 @@
+"""Perfil de desempenho do SQLite aplicado a cada nova conexão.
+
+O padrão do SQLite (journal de rollback, ``synchronous=FULL``) faz escritores
+bloquearem leitores e um fsync completo a cada commit. O perfil de produção
+usa WAL (leitores não bloqueiam durante escritas), ``synchronous=NORMAL``
+(seguro com WAL), espera ``busy_timeout`` em vez de falhar com
+"database is locked", cache e mmap maiores e tabelas temporárias em memória.
+
+As transações são abertas explicitamente (``BEGIN`` no início, não antes do
+primeiro comando de escrita como faz o pysqlite); com a opção de execução
+``sqlite_begin='IMMEDIATE'`` a transação já nasce com o lock de escrita.
+
+Configuração via ``app.config['SQLITE_PROFILE']``: dict que sobrescreve os
+PRAGMAs de ``DEFAULT_PROFILE`` (valor None remove um PRAGMA) ou ``False``
+para desligar o perfil.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 30000,        # ms (mesmo limite do pool_timeout)
+    'cache_size': -20000,         # negativo = KiB (~20 MB por conexão)
+    'mmap_size': 268435456,       # 256 MB
+    'temp_store': 'MEMORY',
+}
+
+# Intervalo (s) entre execuções de PRAGMA optimize (0 desliga)
+DEFAULT_OPTIMIZE_INTERVAL = 3600
+
+# Pool de conexões: o SQLite serializa escritores, então poucas conexões
+# bastam; o pool evita reabrir o arquivo (e reaplicar os PRAGMAs) a cada
+# requisição e o timeout limita a espera quando todos os workers estão ocupados
+DEFAULT_ENGINE_OPTIONS = {
+    'pool_size': 8,
+    'max_overflow': 8,
+    'pool_timeout': 30,
+    'pool_recycle': 3600,
+    'connect_args': {
+        'timeout': 30,
+        'check_same_thread': False,
+    },
+}
+
+
+def resolve_profile(overrides=None):
+    """Combina o perfil padrão com ``overrides`` (None remove o PRAGMA)"""
+    if overrides is False:
+        return {}
+    profile = dict(DEFAULT_PROFILE)
+    for name, value in (overrides or {}).items():
+        if value is None:
+            profile.pop(name, None)
+        else:
+            profile[name] = value
+    return profile
+
+
+# Opções que só valem para um pool de conexões (QueuePool)
+POOL_OPTIONS = ('poolclass', 'pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle')
+
+
+def is_memory_database(database_uri):
+    """True para SQLite em memória (``sqlite://``, ``:memory:``, ``mode=memory``)"""
+    url = make_url(database_uri)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+
+
+def engine_options(overrides=None, database_uri=None):
+    """Opções de engine (pool) para ``SQLALCHEMY_ENGINE_OPTIONS``.
+
+    Com ``database_uri`` as opções se ajustam ao banco: o SQLite em memória
+    usa a conexão única (StaticPool) do Flask-SQLAlchemy, então as opções de
+    pool ficam de fora, e outros bancos não recebem os ``connect_args`` do
+    pysqlite.
+    """
+    options = dict(DEFAULT_ENGINE_OPTIONS)
+    options['connect_args'] = dict(DEFAULT_ENGINE_OPTIONS['connect_args'])
+    options.update(overrides or {})
+    if database_uri is not None:
+        if is_memory_database(database_uri):
+            options = {name: value for name, value in options.items() if name not in POOL_OPTIONS}
+        if make_url(database_uri).get_backend_name() != 'sqlite':
+            options.pop('connect_args', None)
+    return options
+
+
+def apply_sqlite_profile(engine, profile=None, optimize_interval=DEFAULT_OPTIMIZE_INTERVAL):
+    """Registra os PRAGMAs em ``engine`` e o PRAGMA optimize periódico"""
+    if engine.dialect.name != 'sqlite':
+        return
+    profile = resolve_profile(profile)
+    statements = [f'PRAGMA {name}={value}' for name, value in profile.items()]
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        # O pysqlite só emite o BEGIN antes do primeiro INSERT/UPDATE/DELETE:
+        # as leituras anteriores ficariam fora da transação. Desligado aqui,
+        # o BEGIN é emitido pelo evento 'begin' abaixo
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        # execution_options(sqlite_begin='IMMEDIATE') pega o lock de escrita
+        # já no BEGIN (ver _begin_write em src/routes/project_new.py)
+        # Com a conexão única do SQLite em memória (StaticPool) outra
+        # transação pode já estar aberta nela; segue nessa, como o pysqlite
+        if connection.connection.driver_connection.in_transaction:
+            return
+        mode = connection.get_execution_options().get('sqlite_begin')
+        connection.exec_driver_sql(f'BEGIN {mode}' if mode else 'BEGIN')
+
+    if not optimize_interval:
+        return
+
+    state = {'last_run': time.monotonic()}
+    lock = threading.Lock()
+
+    @event.listens_for(engine, 'checkin')
+    def _optimize(dbapi_connection, connection_record):
+        # Roda na conexão devolvida ao pool, fora do caminho da requisição,
+        # no máximo uma vez por intervalo por processo
+        if dbapi_connection is None:
+            return
+        now = time.monotonic()
+        if now - state['last_run'] < optimize_interval or not lock.acquire(blocking=False):
+            return
+        try:
+            state['last_run'] = now
+            dbapi_connection.execute('PRAGMA optimize')
+        except Exception:
+            pass
+        finally:
+            lock.release()
+
+
+def configure_sqlite(app, db):
+    """Aplica o perfil configurado em ``app`` ao engine do Flask-SQLAlchemy"""
+    profile = app.config.get('SQLITE_PROFILE')
+    interval = app.config.get('SQLITE_OPTIMIZE_INTERVAL', DEFAULT_OPTIMIZE_INTERVAL)
+    with app.app_context():
+        apply_sqlite_profile(db.engine, profile, interval)
@@ -0,0 +1,175 @@
+"""Índice em memória dos arquivos estáticos servidos pela aplicação.
+
+Montado na inicialização a partir de ``src/static``: para cada arquivo guarda
+caminho, tamanho, mtime, ETag, content-type e as versões pré-comprimidas
+disponíveis. Com isso a busca de um arquivo e o fallback da SPA viram
+consultas a um dicionário, sem ``os.path.exists`` por requisição.
+
+O índice também conhece o manifesto do frontend: os bundles em ``assets/``
+referenciados (direta ou indiretamente) pelas páginas HTML. Bundles antigos
+que ficaram na pasta após builds anteriores não são servidos.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+
+from flask import request, send_file
+
+from src.precompress import ENCODINGS, is_compressible
+
+# Páginas de entrada da SPA, em ordem de preferência para o fallback
+ENTRY_POINTS = ('index_new.html', 'index.html')
+
+ASSETS_DIR = 'assets'
+
+# Referência a um arquivo de assets dentro de HTML/JS/CSS
+ASSET_REFERENCE = re.compile(r'[A-Za-z0-9_.-]+\.(?:js|css|woff2?|ttf|png|jpe?g|gif|svg|webp|ico)')
+
+# Arquivos gerados que nunca são servidos diretamente
+IGNORED_SUFFIXES = tuple(ENCODINGS.values()) + ('.tmp',)
+
+
+@dataclass
+class StaticEntry:
+    path: str
+    size: int
+    mtime: float
+    etag: str
+    content_type: str
+    # content-encoding -> StaticEntry da versão comprimida
+    encodings: dict = field(default_factory=dict)
+
+
+def _file_entry(path, content_type):
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:20]
+    return StaticEntry(path, stat.st_size, stat.st_mtime, digest, content_type)
+
+
+class StaticIndex:
+    """Mapa caminho relativo -> StaticEntry da pasta estática.
+
+    Com ``refresh_interval`` > 0 o índice confere, no máximo uma vez por
+    intervalo, o mtime das pastas e das páginas de entrada e se reconstrói
+    quando algo mudou (ex.: deploy de um frontend novo sem reiniciar).
+    """
+
+    def __init__(self, folder, refresh_interval=0):
+        self.folder = folder
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._manifest = frozenset()
+        self._fallback = None
+        self._signature = None
+        self._checked_at = 0.0
+        self.build()
+
+    def _folder_signature(self):
+        """mtimes que mudam quando arquivos são adicionados/trocados"""
+        paths = [self.folder, os.path.join(self.folder, ASSETS_DIR)]
+        paths += [os.path.join(self.folder, name) for name in ENTRY_POINTS]
+        return tuple(os.stat(p).st_mtime if os.path.exists(p) else None for p in paths)
+
+    def build(self):
+        """(Re)constrói o índice e o manifesto a partir do disco"""
+        entries = {}
+        for root, _, files in os.walk(self.folder):
+            for filename in files:
+                if filename.endswith(IGNORED_SUFFIXES):
+                    continue
+                path = os.path.join(root, filename)
+                relative = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                entry = _file_entry(path, content_type)
+                if is_compressible(filename):
+                    for encoding, extension in ENCODINGS.items():
+                        if os.path.isfile(path + extension):
+                            entry.encodings[encoding] = _file_entry(path + extension, content_type)
+                entries[relative] = entry
+
+        manifest = self._build_manifest(entries)
+        fallback = next((entries[name] for name in ENTRY_POINTS if name in entries), None)
+
+        with self._lock:
+            self._entries = entries
+            self._manifest = manifest
+            self._fallback = fallback
+            self._signature = self._folder_signature()
+            self._checked_at = time.monotonic()
+
+    def _build_manifest(self, entries):
+        """Assets alcançáveis a partir das páginas HTML"""
+        assets = {
+            name.rsplit('/', 1)[1]
+            for name in entries
+            if name.startswith(ASSETS_DIR + '/') and name.count('/') == 1
+        }
+        pending = [name for name in entries if name.endswith('.html')]
+        reachable = set()
+        while pending:
+            with open(entries[pending.pop()].path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+            for reference in set(ASSET_REFERENCE.findall(content)):
+                if reference in assets and reference not in reachable:
+                    reachable.add(reference)
+                    if reference.endswith(('.js', '.css')):
+                        pending.append(f'{ASSETS_DIR}/{reference}')
+        return frozenset(f'{ASSETS_DIR}/{name}' for name in reachable)
+
+    def _maybe_refresh(self):
+        if not self.refresh_interval:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        if self._folder_signature() != self._signature:
+            self.build()
+
+    @property
+    def fallback(self):
+        """Página servida na raiz e para rotas da SPA"""
+        self._maybe_refresh()
+        return self._fallback
+
+    def lookup(self, path):
+        """Entrada do arquivo ``path`` ou None se não existe / não deve ser servido"""
+        self._maybe_refresh()
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if path.startswith(ASSETS_DIR + '/') and path not in self._manifest:
+            return None
+        return entry
+
+    def is_asset_path(self, path):
+        """Caminhos em assets/ nunca caem no fallback da SPA"""
+        return path.startswith(ASSETS_DIR + '/')
+
+    def send(self, entry):
+        """Envia a entrada, usando a versão .br/.gz quando o cliente aceitar"""
+        served, encoding = entry, None
+        accepted = request.accept_encodings
+        for candidate, compressed in entry.encodings.items():
+            if accepted[candidate]:
+                served, encoding = compressed, candidate
+                break
+
+        response = send_file(
+            served.path,
+            mimetype=entry.content_type,
+            etag=served.etag,
+            last_modified=served.mtime,
+            conditional=True,
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry.encodings:
+            response.vary.add('Accept-Encoding')
+        return response
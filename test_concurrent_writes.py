@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Teste de escritas concorrentes: resumo do portfólio e revisões do histórico
+
+Vários processos (como os workers do gunicorn), cada um com várias threads,
+fazem PUTs simultâneos nos mesmos projetos de um banco temporário. No final
+o resumo (``project_summary``) tem que bater com os dados reais e nenhum
+projeto pode ter duas linhas de histórico com a mesma revisão.
+
+Uso:
+    python test_concurrent_writes.py --processes 4 --threads 12 --requests 720
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import create_app
+from src.models.project import db, ProjectHistory, ProjectSummary
+
+CATEGORIES = ['sensores', 'rastreabilidade', 'inovacao']
+PRIORITIES = ['alta', 'média', 'baixa']
+PROJECT_IDS = [1, 2]
+
+
+def _worker(database_url, threads, requests, seed):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    failures = []
+
+    def run(index):
+        rng = random.Random(seed * 1000 + index)
+        client = app.test_client()
+        for _ in range(requests):
+            response = client.put(f'/api/projects/{rng.choice(PROJECT_IDS)}', json={
+                'category': rng.choice(CATEGORIES),
+                'priority': rng.choice(PRIORITIES),
+                'currentStage': rng.randint(1, 5),
+                'roi': rng.randint(0, 100),
+                'budget': rng.randint(1, 100) * 1000,
+            })
+            if response.status_code != 200:
+                failures.append(response.get_data(as_text=True))
+
+    workers = [threading.Thread(target=run, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    if failures:
+        print(f'   {len(failures)} PUT(s) falharam no processo {os.getpid()}: {failures[0][:200]}')
+        raise SystemExit(1)
+
+
+def run_check(processes=4, threads=12, requests=720):
+    """Roda os PUTs concorrentes.
+
+    Devolve ``(processos com PUTs falhos, divergências do resumo, revisões
+    repetidas)``; tudo vazio/zero quando as escritas são seguras.
+    """
+    directory = tempfile.mkdtemp(prefix='concurrent-writes-')
+    database_url = f"sqlite:///{os.path.join(directory, 'app.db')}"
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+        client = app.test_client()
+        for project_id in PROJECT_IDS:
+            client.post('/api/projects', json={'name': f'Projeto {project_id}', 'category': 'sensores'})
+        with app.app_context():
+            db.engine.dispose()
+
+        per_worker = max(requests // (processes * threads), 1)
+        context = multiprocessing.get_context('fork')
+        children = [context.Process(target=_worker, args=(database_url, threads, per_worker, seed))
+                    for seed in range(processes)]
+        for child in children:
+            child.start()
+        for child in children:
+            child.join()
+        failed = sum(1 for child in children if child.exitcode)
+
+        with app.app_context():
+            mismatches = ProjectSummary.verify()
+            duplicates = db.session.execute(
+                db.select(ProjectHistory.project_id, ProjectHistory.revision)
+                .group_by(ProjectHistory.project_id, ProjectHistory.revision)
+                .having(db.func.count() > 1)
+            ).all()
+            db.engine.dispose()
+        return failed, mismatches, duplicates
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_concurrent_writes():
+    failed, mismatches, duplicates = run_check()
+    assert failed == 0
+    assert mismatches == []
+    assert duplicates == []
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Escritas concorrentes x resumo e histórico')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=12)
+    parser.add_argument('--requests', type=int, default=720)
+    args = parser.parse_args()
+
+    failed, mismatches, duplicates = run_check(args.processes, args.threads, args.requests)
+    for key, stored, live in mismatches:
+        print(f'   resumo {key}: gravado={stored} real={live}')
+    for project_id, revision in duplicates:
+        print(f'   projeto {project_id}: revisão {revision} repetida')
+    if failed or mismatches or duplicates:
+        raise SystemExit(f'❌ {failed} processo(s) com PUTs falhos, {len(mismatches)} divergência(s) '
+                         f'no resumo, {len(duplicates)} revisão(ões) repetida(s)')
+    print('✅ Resumo consistente e revisões únicas após escritas concorrentes')